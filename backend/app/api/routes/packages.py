@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
+import asyncio
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_db
 from app.db.queries.packages import list_packages, get_package_by_id
@@ -13,9 +16,8 @@ def get_packages(conn=Depends(get_db)):
     return list_packages(conn)
 
 
-@router.post("/packages/upload", response_model=Package)
-async def upload_loan_tape(file: UploadFile):
-    """Upload an Excel loan tape and return a parsed Package."""
+def _check_tape_filename(file: UploadFile) -> None:
+    """Reject uploads without an Excel extension (400)."""
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
 
@@ -26,6 +28,12 @@ async def upload_loan_tape(file: UploadFile):
             detail=f"Unsupported file type '.{ext}'. Please upload .xlsx or .xls",
         )
 
+
+@router.post("/packages/upload", response_model=Package)
+async def upload_loan_tape(file: UploadFile):
+    """Upload an Excel loan tape and return a parsed Package."""
+    _check_tape_filename(file)
+
     try:
         package = parse_loan_tape(file.file, file.filename)
     except ValueError as e:
@@ -34,6 +42,29 @@ async def upload_loan_tape(file: UploadFile):
     return package
 
 
+@router.post("/packages/upload_batch", response_model=list[Package])
+async def upload_loan_tapes(files: list[UploadFile] = File(...)):
+    """Upload several Excel loan tapes in one request; Packages come back in order.
+
+    Tapes are parsed concurrently on the threadpool — zip inflation and the
+    pandas column work release the GIL. Any bad tape fails the whole batch.
+    """
+    for file in files:
+        _check_tape_filename(file)
+
+    results = await asyncio.gather(
+        *(run_in_threadpool(parse_loan_tape, f.file, f.filename) for f in files),
+        return_exceptions=True,
+    )
+    for file, result in zip(files, results):
+        if isinstance(result, ValueError):
+            raise HTTPException(status_code=422, detail=f"{file.filename}: {result}")
+        if isinstance(result, BaseException):
+            raise result
+
+    return results
+
+
 @router.get("/packages/{package_id}", response_model=Package)
 def get_package(package_id: str, conn=Depends(get_db)):
     return get_package_by_id(conn, package_id)
@@ -5,6 +5,8 @@ class Settings(BaseSettings):
     SQLSERVER_CONN_STRING: str = ""
     MODEL_DIR: str = "../models"
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
+    # Upper bound on loans held by the parsed-tape memo (~1.4 KB each); 0 disables it
+    TAPE_CACHE_MAX_LOANS: int = 10_000
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -6,14 +6,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.db.connection import db_pool
 from app.services.model_service import initialize_models
+from app.services.track_a_valuation import warm_up_kernel as warm_up_track_a_kernel
+from app.simulation._jit import configure_threading_layer
+from app.simulation.cash_flow import warm_up_kernels
 from app.api.routes import health, packages, valuation, models, prepayment, segmentation
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: initialize DB pool and load models
+    # Startup: initialize DB pool, load models, and compile the JIT kernels
     db_pool.initialize()
     initialize_models()
+    configure_threading_layer()
+    warm_up_kernels()
+    warm_up_track_a_kernel()
     yield
     # Shutdown: close DB pool
     db_pool.close()
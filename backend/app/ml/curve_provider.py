@@ -7,9 +7,10 @@
 """
 from __future__ import annotations
 
-import math
 import logging
 
+import numpy as np
+
 from app.ml.model_loader import ModelRegistry
 
 logger = logging.getLogger(__name__)
@@ -45,7 +46,7 @@ def _generate_stub_curve(bucket_id: int, n_months: int) -> list[float]:
     """Formula-based stub: S(t) = exp(-lambda * t)."""
     annual_hazard = _HAZARD_RATES.get(bucket_id, _DEFAULT_HAZARD)
     monthly_hazard = annual_hazard / 12
-    return [math.exp(-monthly_hazard * m) for m in range(1, n_months + 1)]
+    return np.exp(-monthly_hazard * np.arange(1, n_months + 1)).tolist()
 
 
 def _average_curve(
@@ -57,9 +58,8 @@ def _average_curve(
     all_curves = list(curves.values())
     length = min(len(c) for c in all_curves)
     length = min(length, n_months)
-    avg = []
-    for i in range(length):
-        avg.append(sum(c[i] for c in all_curves) / len(all_curves))
+    stacked = np.array([c[:length] for c in all_curves], dtype=np.float64)
+    avg = (stacked.sum(axis=0) / len(all_curves)).tolist()
     if length < n_months:
         avg = _extend_curve(avg, n_months)
     return avg
@@ -8,11 +8,26 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _read_json(path: Path) -> Any:
+    """Parse a JSON model artifact with orjson.
+
+    Falls back to the stdlib parser for files containing NaN/Infinity
+    literals (json.dumps emits them by default; orjson rejects them).
+    """
+    raw = path.read_bytes()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+
 @dataclass
 class ModelManifest:
     version: str = "0.0.0"
@@ -21,7 +36,7 @@ class ModelManifest:
 
     @classmethod
     def from_file(cls, path: Path) -> "ModelManifest":
-        data = json.loads(path.read_text())
+        data = _read_json(path)
         return cls(
             version=data.get("version", "0.0.0"),
             generated_at=data.get("generated_at", ""),
@@ -91,7 +106,7 @@ class ModelRegistry:
     def _load_bucket_definitions(self) -> None:
         defs_path = self._model_dir / "survival" / "bucket_definitions.json"
         if defs_path.is_file():
-            data = json.loads(defs_path.read_text())
+            data = _read_json(defs_path)
             self.bucket_definitions = data.get("buckets", [])
             logger.info("Loaded %d bucket definitions", len(self.bucket_definitions))
         else:
@@ -179,7 +194,7 @@ class ModelRegistry:
         for name in table_names:
             path = apex2_dir / f"{name}.json"
             if path.is_file():
-                self.apex2_tables[name] = json.loads(path.read_text())
+                self.apex2_tables[name] = _read_json(path)
                 logger.info("Loaded APEX2 %s (%d entries)", name, len(self.apex2_tables[name]))
             else:
                 logger.warning("Missing APEX2 table: %s", path)
@@ -207,7 +222,7 @@ class ModelRegistry:
         # Load tree structure JSON
         structure_path = seg_dir / "tree_structure.json"
         if structure_path.is_file():
-            self.tree_structure = json.loads(structure_path.read_text())
+            self.tree_structure = _read_json(structure_path)
             logger.info(
                 "Loaded tree structure: %d leaves",
                 len(self.tree_structure.get("leaves", [])),
@@ -4,6 +4,9 @@ Provides default probability by DPD severity and loss severity by bucket.
 """
 from __future__ import annotations
 
+import numpy as np
+from numpy.typing import ArrayLike
+
 # Default probability by days-past-due severity tier
 _DEFAULT_PROB_BY_DPD = {
     "current": 0.0,
@@ -34,6 +37,15 @@ def get_default_probability(dpd_severity: str) -> float:
     return _DEFAULT_PROB_BY_DPD.get(dpd_severity.lower(), 0.0)
 
 
-def get_loss_severity(bucket_id: int = 3) -> float:
-    """Return loss-given-default as a fraction (0-1) for a bucket."""
-    return _LOSS_SEVERITY.get(bucket_id, _DEFAULT_SEVERITY)
+def get_loss_severity(bucket_id: ArrayLike = 3) -> float | np.ndarray:
+    """Return loss-given-default as a fraction (0-1) for a bucket.
+
+    Accepts a scalar bucket_id (returns float) or an array of them
+    (returns an ndarray of the same shape).
+    """
+    if np.ndim(bucket_id) == 0:
+        return _LOSS_SEVERITY.get(bucket_id, _DEFAULT_SEVERITY)
+    ids = np.asarray(bucket_id)
+    return np.array(
+        [_LOSS_SEVERITY.get(b, _DEFAULT_SEVERITY) for b in ids.ravel().tolist()], dtype=np.float64,
+    ).reshape(ids.shape)
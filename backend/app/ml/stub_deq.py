@@ -7,6 +7,9 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
+from numpy.typing import ArrayLike
+
 # Base annual DEQ rates by bucket
 _BASE_RATES = {
     1: 0.01,   # Prime
@@ -19,12 +22,20 @@ _DEFAULT_BASE = 0.05
 _SEASONING_DECAY = 0.02
 
 
-def get_deq_rate(bucket_id: int, loan_age: int) -> float:
+def get_deq_rate(bucket_id: ArrayLike, loan_age: ArrayLike) -> float | np.ndarray:
     """Return monthly delinquency rate for a bucket at a given loan age (months).
 
     Seasoning effect: rate declines exponentially as loan ages.
+    Scalars return a float; array inputs broadcast (e.g. buckets[:, None]
+    against ages[None, :]) and return an ndarray.
     """
-    base = _BASE_RATES.get(bucket_id, _DEFAULT_BASE)
+    if np.ndim(bucket_id) == 0 and np.ndim(loan_age) == 0:
+        monthly_base = _BASE_RATES.get(bucket_id, _DEFAULT_BASE) / 12
+        return monthly_base * math.exp(-_SEASONING_DECAY * loan_age)
+    ids = np.asarray(bucket_id)
+    base = np.array(
+        [_BASE_RATES.get(b, _DEFAULT_BASE) for b in ids.ravel().tolist()], dtype=np.float64,
+    ).reshape(ids.shape)
     monthly_base = base / 12
-    seasoning = math.exp(-_SEASONING_DECAY * loan_age)
+    seasoning = np.exp(-_SEASONING_DECAY * np.asarray(loan_age, dtype=np.float64))
     return monthly_base * seasoning
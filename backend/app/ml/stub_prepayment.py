@@ -6,6 +6,9 @@ typical non-prime loan tapes.
 """
 from __future__ import annotations
 
+import numpy as np
+from numpy.typing import ArrayLike
+
 # Base annual CPR by bucket (higher = more likely to prepay)
 _BASE_CPR: dict[int, float] = {
     1: 0.12,   # Prime — best refi access
@@ -20,51 +23,78 @@ _MAX_CPR = 0.60  # Hard cap on annual CPR
 _SEASONING_RAMP_MONTHS = 30  # PSA-style linear ramp
 
 
-def cpr_to_smm(cpr: float) -> float:
+def cpr_to_smm(cpr: ArrayLike) -> float | np.ndarray:
     """Convert annual CPR to single monthly mortality (SMM).
 
     SMM = 1 - (1 - CPR)^(1/12)
+
+    Scalars return a float; arrays are converted elementwise.
     """
-    cpr = max(0.0, min(cpr, 1.0))
-    return 1.0 - (1.0 - cpr) ** (1.0 / 12.0)
+    if isinstance(cpr, (int, float)):
+        cpr = max(0.0, min(cpr, 1.0))
+        return 1.0 - (1.0 - cpr) ** (1.0 / 12.0)
+    clamped = np.clip(np.asarray(cpr, dtype=np.float64), 0.0, 1.0)
+    smm = 1.0 - (1.0 - clamped) ** (1.0 / 12.0)
+    return float(smm) if smm.ndim == 0 else smm
 
 
-def seasoning_multiplier(loan_age: int) -> float:
-    """PSA-style seasoning ramp: linear 0→1 over first 30 months."""
-    if loan_age <= 0:
-        return 0.0
-    return min(loan_age / _SEASONING_RAMP_MONTHS, 1.0)
+def seasoning_multiplier(loan_age: ArrayLike) -> float | np.ndarray:
+    """PSA-style seasoning ramp: linear 0→1 over first 30 months.
 
+    Scalars return a float; arrays are ramped elementwise.
+    """
+    if isinstance(loan_age, (int, float)):
+        if loan_age <= 0:
+            return 0.0
+        return min(loan_age / _SEASONING_RAMP_MONTHS, 1.0)
+    ramp = np.clip(np.asarray(loan_age, dtype=np.float64) / _SEASONING_RAMP_MONTHS, 0.0, 1.0)
+    return float(ramp) if ramp.ndim == 0 else ramp
 
-def rate_incentive_factor(loan_rate: float, market_rate: float = 0.065) -> float:
+
+def rate_incentive_factor(loan_rate: ArrayLike, market_rate: float = 0.065) -> float | np.ndarray:
     """Rate incentive multiplier for prepayment.
 
     - loan_rate < market_rate → 0.5x (some moves/sales still happen)
     - loan_rate ≈ market_rate → 1.0x
     - loan_rate > market_rate + 2% → up to 4.0x (strong refi incentive)
+
+    Scalars return a float; arrays are evaluated elementwise.
     """
-    spread = loan_rate - market_rate
-    if spread <= -0.01:
-        return 0.5
-    if spread <= 0.01:
-        return 1.0
+    if isinstance(loan_rate, (int, float)):
+        spread = loan_rate - market_rate
+        if spread <= -0.01:
+            return 0.5
+        if spread <= 0.01:
+            return 1.0
+        # Linear ramp from 1.0 at +1% to 4.0 at +2%
+        return 1.0 + 3.0 * min((spread - 0.01) / 0.01, 1.0)
+    spread = np.asarray(loan_rate, dtype=np.float64) - market_rate
     # Linear ramp from 1.0 at +1% to 4.0 at +2%
-    factor = 1.0 + 3.0 * min((spread - 0.01) / 0.01, 1.0)
-    return factor
+    ramp = 1.0 + 3.0 * np.minimum((spread - 0.01) / 0.01, 1.0)
+    factor = np.where(spread <= -0.01, 0.5, np.where(spread <= 0.01, 1.0, ramp))
+    return float(factor) if factor.ndim == 0 else factor
 
 
 def get_prepay_hazard(
-    bucket_id: int,
-    loan_age: int,
-    loan_rate: float,
+    bucket_id: ArrayLike,
+    loan_age: ArrayLike,
+    loan_rate: ArrayLike,
     market_rate: float = 0.065,
-) -> float:
+) -> float | np.ndarray:
     """Return monthly prepayment hazard (SMM) for a loan.
 
     Combines base CPR, seasoning ramp, and rate incentive, then converts
     to monthly SMM. Result is capped to prevent unrealistic values.
+    Scalars return a float; array inputs broadcast (e.g. a bucket x age x
+    rate grid) and return an ndarray.
     """
-    base_cpr = _BASE_CPR.get(bucket_id, _DEFAULT_CPR)
-    adjusted_cpr = base_cpr * seasoning_multiplier(loan_age) * rate_incentive_factor(loan_rate, market_rate)
-    capped_cpr = min(adjusted_cpr, _MAX_CPR)
-    return cpr_to_smm(capped_cpr)
+    seasoning = seasoning_multiplier(loan_age)
+    incentive = rate_incentive_factor(loan_rate, market_rate)
+    if isinstance(bucket_id, int) and isinstance(seasoning, float) and isinstance(incentive, float):
+        capped_cpr = min(_BASE_CPR.get(bucket_id, _DEFAULT_CPR) * seasoning * incentive, _MAX_CPR)
+        return cpr_to_smm(capped_cpr)
+    ids = np.asarray(bucket_id)
+    base_cpr = np.array(
+        [_BASE_CPR.get(b, _DEFAULT_CPR) for b in ids.ravel().tolist()], dtype=np.float64,
+    ).reshape(ids.shape)
+    return cpr_to_smm(np.minimum(base_cpr * seasoning * incentive, _MAX_CPR))
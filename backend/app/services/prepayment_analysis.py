@@ -7,6 +7,9 @@ sensitivity.
 import math
 from collections import defaultdict
 
+import numpy as np
+from numpy.typing import ArrayLike
+
 from app.models.package import Package
 from app.ml.model_loader import ModelRegistry
 from app.models.prepayment import (
@@ -174,10 +177,19 @@ def compute_apex2_multiplier(
 # ---------------------------------------------------------------------------
 # Projection functions
 # ---------------------------------------------------------------------------
-def seasoning_multiplier(age: float, ramp_months: int = 30) -> float:
-    if age <= 0:
-        return 0.0
-    return min(age / ramp_months, 1.0)
+def seasoning_multiplier(age: ArrayLike, ramp_months: int = 30) -> float | np.ndarray:
+    """Linear seasoning ramp 0→1 over ramp_months; zero at or before origination.
+
+    Shared by project_effective_life and its batch variant. Scalars return a
+    float; arrays are ramped elementwise.
+    """
+    if isinstance(age, (int, float)):
+        if age <= 0:
+            return 0.0
+        return min(age / ramp_months, 1.0)
+    age = np.asarray(age, dtype=np.float64)
+    ramp = np.where(age <= 0, 0.0, np.minimum(age / ramp_months, 1.0))
+    return float(ramp) if ramp.ndim == 0 else ramp
 
 
 def compute_pandi(balance: float, rate_pct: float, remaining_term: int) -> float:
@@ -202,6 +214,22 @@ def apex2_amortize(pv: float, pmt: float, rate_pct: float, ppy: int = 12):
     return math.ceil(-math.log(1 - ratio) / math.log(1 + r))
 
 
+def apex2_amortize_batch(
+    pv: np.ndarray, pmt: np.ndarray, rate_pct: np.ndarray, ppy: int = 12,
+) -> np.ndarray:
+    """Vectorized apex2_amortize; NaN where the scalar version returns None."""
+    pv, pmt, rate_pct = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (pv, pmt, rate_pct))
+    )
+    r = rate_pct / ppy / 100
+    valid = (r > 0) & (pmt > 0)
+    ratio = np.divide(pv * r, pmt, out=np.ones_like(r), where=valid)
+    valid &= ratio < 1
+    nper = np.full(r.shape, np.nan)
+    nper[valid] = np.ceil(-np.log(1 - ratio[valid]) / np.log(1 + r[valid]))
+    return nper
+
+
 def project_effective_life(
     balance: float,
     pandi: float,
@@ -232,6 +260,53 @@ def project_effective_life(
     return remaining_term
 
 
+def project_effective_life_batch(
+    balance: np.ndarray,
+    pandi: np.ndarray,
+    rate_pct: np.ndarray,
+    multiplier: np.ndarray,
+    seasoning: np.ndarray,
+    remaining_term: np.ndarray,
+    use_seasoning: bool = True,
+    ramp_months: int = 30,
+) -> np.ndarray:
+    """Vectorized project_effective_life over broadcast-compatible arrays.
+
+    All loans (and e.g. assumed-age sweep points, via broadcasting) step
+    through the months together; each element stops when its balance
+    reaches ~0 or its remaining term runs out. Results match the scalar
+    function element for element.
+    """
+    balance, pandi, rate_pct, multiplier, seasoning, remaining_term = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in
+          (balance, pandi, rate_pct, multiplier, seasoning, remaining_term))
+    )
+    r = rate_pct / 12 / 100
+    extra_base = pandi * np.maximum(multiplier - 1, 0)
+    bal = balance.copy()
+    life = remaining_term.astype(np.int64)
+    active = np.ones(bal.shape, dtype=bool)
+    max_term = int(remaining_term.max()) if remaining_term.size else 0
+
+    for m in range(1, max_term + 1):
+        active &= m <= remaining_term
+        paid_off = active & (bal <= 1)
+        life[paid_off] = m - 1
+        active &= ~paid_off
+        if not active.any():
+            break
+        if use_seasoning:
+            s = seasoning_multiplier(seasoning + m, ramp_months)
+        else:
+            s = 1.0
+        interest = bal * r
+        sched = np.minimum(pandi, bal * (1 + r))
+        principal = sched - interest
+        extra = extra_base * s
+        bal = np.where(active, np.maximum(bal - principal - extra, 0), bal)
+    return life
+
+
 # ---------------------------------------------------------------------------
 # Main analysis entry point
 # ---------------------------------------------------------------------------
@@ -298,24 +373,30 @@ def run_prepayment_analysis(
         ("Seasoned (new, age=0)", True, 0),
     ]
 
+    # Per-loan columns for the batched effective-life projections
+    balances = np.array([ld["balance"] for ld in loan_data], dtype=np.float64)
+    pandis = np.array([ld["pandi"] for ld in loan_data], dtype=np.float64)
+    rates = np.array([ld["rate_pct"] for ld in loan_data], dtype=np.float64)
+    ages = np.array([ld["age"] for ld in loan_data], dtype=np.float64)
+    rems = np.array([ld["rem"] for ld in loan_data], dtype=np.float64)
+    mults = {
+        src_key: np.array([ld["dims"][src_key] for ld in loan_data], dtype=np.float64)
+        for src_key in ("avg_4dim", "credit_only")
+    }
+
     scenarios = []
     for src_label, src_key in mult_sources:
         for meth_label, use_seas, override_age in methods:
-            nper_total = 0.0
-            monthly_total = 0.0
-            for ld in loan_data:
-                mult = ld["dims"][src_key]
-                age = override_age if override_age is not None else ld["age"]
-
-                nper = apex2_amortize(ld["balance"], ld["pandi"] * mult, ld["rate_pct"])
-                life = project_effective_life(
-                    ld["balance"], ld["pandi"], ld["rate_pct"],
-                    mult, age, ld["rem"],
-                    use_seasoning=use_seas, ramp_months=ramp,
-                )
-                if nper is not None:
-                    nper_total += nper * ld["balance"]
-                monthly_total += life * ld["balance"]
+            npers = apex2_amortize_batch(balances, pandis * mults[src_key], rates)
+            solved = ~np.isnan(npers)
+            nper_total = float(npers[solved] @ balances[solved])
+
+            lives = project_effective_life_batch(
+                balances, pandis, rates, mults[src_key],
+                ages if override_age is None else override_age, rems,
+                use_seasoning=use_seas, ramp_months=ramp,
+            )
+            monthly_total = float(lives @ balances)
 
             wtd_nper = nper_total / total_upb if nper_total > 0 else None
             wtd_monthly = monthly_total / total_upb
@@ -350,15 +431,17 @@ def run_prepayment_analysis(
         avg_rate = sum(ld["rate_pct"] * ld["balance"] for ld in group) / group_upb
 
         # Effective life using 4-dim avg, flat method
-        eff_life_total = 0.0
-        for ld in group:
-            life = project_effective_life(
-                ld["balance"], ld["pandi"], ld["rate_pct"],
-                ld["dims"]["avg_4dim"], ld["age"], ld["rem"],
-                use_seasoning=False, ramp_months=ramp,
-            )
-            eff_life_total += life * ld["balance"]
-        eff_life = eff_life_total / group_upb
+        group_balances = np.array([ld["balance"] for ld in group], dtype=np.float64)
+        group_lives = project_effective_life_batch(
+            group_balances,
+            np.array([ld["pandi"] for ld in group], dtype=np.float64),
+            np.array([ld["rate_pct"] for ld in group], dtype=np.float64),
+            np.array([ld["dims"]["avg_4dim"] for ld in group], dtype=np.float64),
+            np.array([ld["age"] for ld in group], dtype=np.float64),
+            np.array([ld["rem"] for ld in group], dtype=np.float64),
+            use_seasoning=False, ramp_months=ramp,
+        )
+        eff_life = float(group_lives @ group_balances) / group_upb
 
         credit_bands.append(CreditBandRow(
             band=band,
@@ -371,17 +454,15 @@ def run_prepayment_analysis(
         ))
 
     # --- Seasoning sensitivity ---
+    # One broadcast projection over (assumed_age, loan)
+    assumed_ages = np.arange(0, 61, 6)
+    sweep_lives = project_effective_life_batch(
+        balances, pandis, rates, mults["avg_4dim"],
+        assumed_ages[:, None], rems,
+        use_seasoning=True, ramp_months=ramp,
+    )
     sensitivity = []
-    for assumed_age in range(0, 61, 6):
-        life_total = 0.0
-        for ld in loan_data:
-            mult = ld["dims"]["avg_4dim"]
-            life = project_effective_life(
-                ld["balance"], ld["pandi"], ld["rate_pct"],
-                mult, assumed_age, ld["rem"],
-                use_seasoning=True, ramp_months=ramp,
-            )
-            life_total += life * ld["balance"]
+    for assumed_age, life_total in zip(assumed_ages.tolist(), (sweep_lives @ balances).tolist()):
         wtd_life = life_total / total_upb
         sensitivity.append(SeasoningSensitivityPoint(
             assumed_age_months=assumed_age,
@@ -7,6 +7,8 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+import numpy as np
+
 from app.models.package import Package
 from app.models.simulation import SimulationConfig
 from app.models.valuation import PackageValuationResult
@@ -40,13 +42,15 @@ def run_valuation(package: Package, config: SimulationConfig) -> PackageValuatio
     npv_distribution: list[float] = []
     if loan_results and loan_results[0].pv_distribution:
         n_sims = len(loan_results[0].pv_distribution)
+        # (n_loans, n_sims) matrix filled row by row; loans with fewer paths
+        # pad with expected_pv
+        paths = np.empty((len(loan_results), n_sims))
+        for i, lr in enumerate(loan_results):
+            pvs = lr.pv_distribution[:n_sims]
+            paths[i, :len(pvs)] = pvs
+            paths[i, len(pvs):] = lr.expected_pv
         # Sum by simulation-path index across loans (preserves natural correlation)
-        for i in range(n_sims):
-            total = sum(
-                lr.pv_distribution[i] if i < len(lr.pv_distribution) else lr.expected_pv
-                for lr in loan_results
-            )
-            npv_distribution.append(round(total, 2))
+        npv_distribution = [round(total, 2) for total in paths.sum(axis=0).tolist()]
     npv_distribution.sort()
 
     # NPV percentiles
@@ -6,16 +6,30 @@ common tape convention of rates and LTVs expressed as percentages.
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
-from io import BytesIO
+import threading
+from collections import OrderedDict
+from functools import cache
 from typing import BinaryIO
 
+from app.config import settings
 from app.models.loan import Loan
 from app.models.package import Package
 
 logger = logging.getLogger(__name__)
 
+# Parsed tapes keyed by content digest, most recently used last.  Brokers
+# re-upload the same tape after fixing a validation error, often renamed; a
+# hit skips the Excel reader entirely and only the package name is redone.
+# Bounded by total loan count (settings.TAPE_CACHE_MAX_LOANS), not entries,
+# so a few huge tapes can't pin hundreds of MB.
+_tape_cache: OrderedDict[bytes, Package] = OrderedDict()
+_tape_cache_loans = 0
+_tape_cache_lock = threading.Lock()
+_HASH_CHUNK = 1 << 20
+
 
 # ---------------------------------------------------------------------------
 # Column matching helpers
@@ -72,22 +86,75 @@ def _find_column(columns: list[str], key: str) -> str | None:
 # Public API
 # ---------------------------------------------------------------------------
 def parse_loan_tape(file: BinaryIO, filename: str) -> Package:
-    """Parse an Excel loan tape into a Package.
+    """Parse an Excel loan tape into a Package, memoized on the content hash.
+
+    The upload is streamed twice — once in chunks through the hash, once by
+    the Excel reader on a cache miss — and never buffered whole, so peak
+    memory stays at the spool threshold for FastAPI's SpooledTemporaryFile.
+    The cache holds 32-byte digests, not the uploaded bytes.  Each call gets
+    its own deep copy, so callers may mutate the result freely.
 
     Raises ValueError on invalid / empty data.
     """
-    try:
-        import openpyxl  # noqa: F401 — ensure dependency available
-    except ImportError:
-        raise ValueError("openpyxl is required to parse Excel files")
+    start = file.tell()
+    hasher = hashlib.blake2b(digest_size=32)
+    for chunk in iter(lambda: file.read(_HASH_CHUNK), b""):
+        hasher.update(chunk)
+    if file.tell() == start:
+        raise ValueError("Uploaded file is empty")
+    file.seek(start)
 
-    import pandas as pd
+    key = hasher.digest()
+    with _tape_cache_lock:
+        package = _tape_cache.get(key)
+        if package is not None:
+            _tape_cache.move_to_end(key)
+    if package is None:
+        package = _parse_tape(file, filename)
+        _remember_tape(key, package)
+    return package.model_copy(update={"name": _package_name(filename)}, deep=True)
 
-    data = file.read()
-    if not data:
-        raise ValueError("Uploaded file is empty")
 
-    df = pd.read_excel(BytesIO(data))
+def clear_tape_cache() -> int:
+    """Drop every memoized tape; return how many entries were evicted.
+
+    In-process only (tests, scripts) — deliberately not exposed over HTTP.
+    """
+    global _tape_cache_loans
+    with _tape_cache_lock:
+        n = len(_tape_cache)
+        _tape_cache.clear()
+        _tape_cache_loans = 0
+    return n
+
+
+def _remember_tape(key: bytes, package: Package) -> None:
+    """Memoize a parsed tape, evicting least-recently-used tapes over the loan budget."""
+    global _tape_cache_loans
+    budget = settings.TAPE_CACHE_MAX_LOANS
+    if package.loan_count > budget:
+        return  # never cache a tape that alone exceeds the budget
+    with _tape_cache_lock:
+        if key in _tape_cache:  # a concurrent upload of the same tape got here first
+            return
+        _tape_cache[key] = package
+        _tape_cache_loans += package.loan_count
+        while _tape_cache_loans > budget:
+            _, evicted = _tape_cache.popitem(last=False)
+            _tape_cache_loans -= evicted.loan_count
+
+
+def _parse_tape(file: BinaryIO, filename: str) -> Package:
+    engine = _excel_engine()
+    if engine is None:
+        try:
+            import openpyxl  # noqa: F401 — ensure dependency available
+        except ImportError:
+            raise ValueError("openpyxl is required to parse Excel files")
+
+    import pandas as pd
+
+    df = pd.read_excel(file, engine=engine)
     df.columns = [str(c).strip() for c in df.columns]
 
     if df.empty:
@@ -171,14 +238,11 @@ def parse_loan_tape(file: BinaryIO, filename: str) -> Package:
     if not loans:
         raise ValueError("No valid loans could be parsed from the file")
 
-    # Derive package name from filename
-    name = re.sub(r"\.(xlsx?|csv)$", "", filename, flags=re.IGNORECASE)
-    name = name.replace("_", " ").replace("-", " ").strip()
     total_upb = sum(l.unpaid_balance for l in loans)
 
     return Package(
         package_id=f"PKG-UPLOAD-{len(loans):04d}",
-        name=name,
+        name=_package_name(filename),
         loan_count=len(loans),
         total_upb=total_upb,
         loans=loans,
@@ -188,6 +252,27 @@ def parse_loan_tape(file: BinaryIO, filename: str) -> Package:
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
+def _package_name(filename: str) -> str:
+    """Derive the package name from the upload filename."""
+    name = re.sub(r"\.(xlsx?|csv)$", "", filename, flags=re.IGNORECASE)
+    return name.replace("_", " ").replace("-", " ").strip()
+
+
+@cache
+def _excel_engine() -> str | None:
+    """Return "calamine" when python-calamine is installed, else None.
+
+    calamine (Rust) streams the sheet and reads .xlsx and .xls alike.  None
+    lets pandas pick by file type — openpyxl for .xlsx, which pandas opens
+    read_only/data_only so no Cell object is built per XML element.
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    return "calamine"
+
+
 def _safe_float(row, col: str | None, default: float) -> float:
     if col is None:
         return default
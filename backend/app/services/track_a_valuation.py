@@ -9,6 +9,8 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+import numpy as np
+
 from app.models.loan import Loan
 from app.models.package import Package
 from app.models.simulation import SimulationConfig, TrackAConfig
@@ -24,6 +26,7 @@ from app.services.prepayment_analysis import (
     compute_apex2_multiplier,
     compute_pandi,
 )
+from app.simulation._jit import njit
 
 _TRACK_A_VERSION = "1.0.0"
 _SERVICING_ANNUAL = 0.0025  # 25 bps
@@ -40,6 +43,79 @@ def _get_track_a_provenance(config: TrackAConfig) -> ModelProvenance:
     )
 
 
+# Column layout of the array returned by _track_a_core
+(
+    _TA_PAYMENT, _TA_SURVIVAL, _TA_EXP_PAYMENT, _TA_CREDIT_LOSS, _TA_SERVICING, _TA_NET_CF, _TA_DISCOUNT, _TA_PV,
+) = range(8)
+_TA_N_COLS = 8
+
+
+@njit(cache=True)
+def _track_a_core(
+    balance: float,
+    r_loan: float,
+    r_yield: float,
+    eff_pmt: float,
+    monthly_default: float,
+    net_lgd: float,
+    servicing_monthly: float,
+    n_months: int,
+) -> tuple[np.ndarray, float]:
+    """Track A amortization loop: flat CDR, accelerated payment, target-yield discount.
+
+    Returns (rows, total_pv): an (n_months_run, _TA_N_COLS) array whose rows
+    stop once the balance is exhausted, and the PV summed month by month.
+    """
+    out = np.zeros((n_months, _TA_N_COLS))
+    cumul_surv = 1.0
+    total_pv = 0.0
+    n_run = 0
+
+    for i in range(n_months):
+        if balance <= 0.01:
+            break
+
+        surv_entering = cumul_surv
+
+        # Credit defaults reduce the performing pool
+        cumul_surv *= (1.0 - monthly_default)
+
+        # Payment capped at balance + interest
+        interest = balance * r_loan
+        payment = min(eff_pmt, balance + interest)
+        expected_pmt = payment * cumul_surv
+
+        # Credit loss: defaulted portion x net LGD
+        net_credit_loss = monthly_default * net_lgd * balance * surv_entering
+
+        # Servicing on surviving balance
+        serv = balance * servicing_monthly * cumul_surv
+
+        net_cf = expected_pmt - net_credit_loss - serv
+
+        # Discount at target yield (float exponent -> libm pow, as in CPython)
+        df = 1.0 / (1.0 + r_yield) ** float(i + 1)
+        pv = net_cf * df
+        total_pv += pv
+
+        out[i, _TA_PAYMENT] = payment
+        out[i, _TA_SURVIVAL] = cumul_surv
+        out[i, _TA_EXP_PAYMENT] = expected_pmt
+        out[i, _TA_CREDIT_LOSS] = net_credit_loss
+        out[i, _TA_SERVICING] = serv
+        out[i, _TA_NET_CF] = net_cf
+        out[i, _TA_DISCOUNT] = df
+        out[i, _TA_PV] = pv
+        n_run = i + 1
+
+        # Amortize: accelerated principal + default exits
+        principal = min(payment - interest, balance)
+        default_red = monthly_default * balance * surv_entering
+        balance = max(balance - principal - default_red, 0.0)
+
+    return out[:n_run], total_pv
+
+
 def track_a_loan_pv(
     loan: Loan,
     track_a_config: TrackAConfig,
@@ -74,62 +150,41 @@ def track_a_loan_pv(
 
     bucket_id = assign_bucket(loan.model_dump())
 
-    cumul_surv = 1.0
-    total_pv = 0.0
-    cash_flows: list[MonthlyCashFlow] = []
-
-    for month_num in range(1, n_months + 1):
-        if balance <= 0.01:
-            break
-
-        surv_entering = cumul_surv
-
-        # Credit defaults reduce the performing pool
-        cumul_surv *= (1.0 - monthly_default)
-
-        # Payment capped at balance + interest
-        interest = balance * r_loan
-        payment = min(eff_pmt, balance + interest)
-        expected_pmt = payment * cumul_surv
-
-        # Credit loss: defaulted portion x net LGD
-        net_credit_loss = monthly_default * net_lgd * balance * surv_entering
-
-        # Servicing on surviving balance
-        serv = balance * servicing_monthly * cumul_surv
-
-        net_cf = expected_pmt - net_credit_loss - serv
-
-        # Discount at target yield
-        df = 1.0 / (1.0 + r_yield) ** month_num
-        pv = net_cf * df
-        total_pv += pv
+    core, total_pv = _track_a_core(
+        float(balance), r_loan, r_yield, eff_pmt, monthly_default, net_lgd, servicing_monthly, n_months,
+    )
 
+    default_probability = round(monthly_default, 6)
+    cash_flows: list[MonthlyCashFlow] = []
+    for i, row in enumerate(core.tolist()):
         cash_flows.append(MonthlyCashFlow(
-            month=month_num,
-            scheduled_payment=round(payment, 2),
-            survival_probability=round(cumul_surv, 6),
-            expected_payment=round(expected_pmt, 2),
+            month=i + 1,
+            scheduled_payment=round(row[_TA_PAYMENT], 2),
+            survival_probability=round(row[_TA_SURVIVAL], 6),
+            expected_payment=round(row[_TA_EXP_PAYMENT], 2),
             deq_probability=0.0,
-            default_probability=round(monthly_default, 6),
-            expected_loss=round(net_credit_loss, 2),
+            default_probability=default_probability,
+            expected_loss=round(row[_TA_CREDIT_LOSS], 2),
             expected_recovery=0.0,
             prepay_probability=0.0,
             expected_prepayment=0.0,
-            servicing_cost=round(serv, 2),
-            net_cash_flow=round(net_cf, 2),
-            discount_factor=round(df, 6),
-            present_value=round(pv, 2),
+            servicing_cost=round(row[_TA_SERVICING], 2),
+            net_cash_flow=round(row[_TA_NET_CF], 2),
+            discount_factor=round(row[_TA_DISCOUNT], 6),
+            present_value=round(row[_TA_PV], 2),
         ))
 
-        # Amortize: accelerated principal + default exits
-        principal = min(payment - interest, balance)
-        default_red = monthly_default * balance * surv_entering
-        balance = max(balance - principal - default_red, 0.0)
-
     return total_pv, cash_flows
 
 
+def warm_up_kernel() -> None:
+    """Compile (or load from cache) _track_a_core on a one-month dummy loan.
+
+    Called at app startup alongside cash_flow.warm_up_kernels.
+    """
+    _track_a_core(1000.0, 0.004, 0.008, 1004.17, 0.001, 0.5, 0.0002, 1)
+
+
 def valuate_loan_track_a(
     loan: Loan,
     config: SimulationConfig,
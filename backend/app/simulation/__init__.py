@@ -1,7 +1,12 @@
 """Simulation engine — scenarios, transitions, cash flows, and Monte Carlo."""
 from app.simulation.scenarios import get_scenario_params, list_scenario_names, ScenarioParams
-from app.simulation.state_transitions import get_monthly_transitions, MonthlyTransition
-from app.simulation.cash_flow import project_cash_flows, calculate_monthly_payment
+from app.simulation.state_transitions import (
+    get_monthly_transition_arrays,
+    get_monthly_transitions,
+    MonthlyTransition,
+    MonthlyTransitionArrays,
+)
+from app.simulation.cash_flow import project_cash_flows, project_cash_flows_multi, calculate_monthly_payment
 from app.simulation.engine import simulate_loan
 
 __all__ = [
@@ -10,7 +15,10 @@ __all__ = [
     "list_scenario_names",
     "MonthlyTransition",
     "get_monthly_transitions",
+    "MonthlyTransitionArrays",
+    "get_monthly_transition_arrays",
     "project_cash_flows",
+    "project_cash_flows_multi",
     "calculate_monthly_payment",
     "simulate_loan",
 ]
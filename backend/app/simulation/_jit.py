@@ -0,0 +1,74 @@
+"""Optional Numba JIT for the simulation hot loops.
+
+Kernels are written against plain NumPy arrays so they run unchanged when
+numba is not installed — ``njit`` then degrades to a no-op decorator and
+``prange`` to ``range``.
+
+``PARALLEL`` is the value to pass as ``njit(parallel=...)``. It is only True
+when the OpenMP threading layer is the one in use (see
+configure_threading_layer, called at app startup): kernels are launched from
+uvicorn/anyio worker threads, and the TBB layer hangs interpreter shutdown
+once a prange kernel has run off the main thread, while workqueue is not
+safe for concurrent launches. Without OpenMP the kernels compile serially.
+
+The amortization loops are deliberately not Cython/C extensions: the
+backend ships as plain source (no setup.py or compiler in the image), and
+the numba kernels already run the per-month loop as typed machine code.
+"""
+from __future__ import annotations
+
+import os
+
+try:
+    import numba
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional — fall back to the interpreter
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn):
+            return fn
+
+        return decorator
+
+
+def _omp_layer_selected() -> bool:
+    """True when prange kernels will run on OpenMP; decided without side effects.
+
+    An explicit NUMBA_THREADING_LAYER is honoured as-is, and only "omp" turns
+    parallel kernels on. Unset, OpenMP is used if numba was built with it —
+    configure_threading_layer() then selects it at startup.
+    """
+    if not HAVE_NUMBA:
+        return False
+    if "NUMBA_THREADING_LAYER" in os.environ and numba.config.THREADING_LAYER != "omp":
+        return False  # workqueue/tbb/"safe" etc. — run the kernels serially
+    try:
+        from numba.np.ufunc import omppool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+PARALLEL = _omp_layer_selected()
+
+
+def configure_threading_layer() -> None:
+    """Select numba's OpenMP threading layer for the prange kernels.
+
+    Call once at process startup, before the first kernel launch — numba
+    binds the layer on first use. No-op when PARALLEL is False or the layer
+    was chosen explicitly through NUMBA_THREADING_LAYER.
+    """
+    if PARALLEL and "NUMBA_THREADING_LAYER" not in os.environ:
+        numba.config.THREADING_LAYER = "omp"
+
+
+__all__ = ["HAVE_NUMBA", "PARALLEL", "configure_threading_layer", "njit", "prange"]
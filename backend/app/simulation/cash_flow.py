@@ -2,14 +2,21 @@
 
 Produces a list of MonthlyCashFlow objects using standard amortization (PMT)
 and survival-weighted expected values from the state transition model.
+The per-month arithmetic runs in ``_project_core`` over NumPy arrays and is
+JIT-compiled when numba is installed.
 """
 from __future__ import annotations
 
+from typing import Sequence
+
+import numpy as np
+
 from app.models.loan import Loan
 from app.models.valuation import MonthlyCashFlow
 from app.simulation.scenarios import ScenarioParams
-from app.simulation.state_transitions import get_monthly_transitions
+from app.simulation.state_transitions import get_monthly_transition_arrays
 from app.ml.stub_cost_of_capital import get_monthly_discount_rate
+from app.simulation._jit import PARALLEL, njit, prange
 
 _SERVICING_COST_ANNUAL = 0.0025  # 25 bps annual
 
@@ -27,11 +34,105 @@ def calculate_monthly_payment(balance: float, annual_rate: float, remaining_mont
     return balance * r / (1.0 - (1.0 + r) ** -remaining_months)
 
 
+# Column layout of the array returned by _project_core
+_SCHEDULED, _SURVIVAL, _EXP_PAYMENT, _EXP_LOSS, _EXP_PREPAY, _SERVICING, _NET_CF = range(7)
+_N_COLS = 7
+
+
+@njit(cache=True)
+def _project_core(
+    balance: float,
+    annual_rate: float,
+    pmt: float,
+    monthly_servicing: float,
+    marginal_default: np.ndarray,
+    marginal_prepay: np.ndarray,
+    loss_severity: np.ndarray,
+    recovery_rate: np.ndarray,
+) -> np.ndarray:
+    """Amortization hot loop over one path.
+
+    Returns an (n_months_run, _N_COLS) array; rows stop early once the
+    balance is exhausted. Discounting is applied by the caller.
+    """
+    n = marginal_default.shape[0]
+    out = np.zeros((n, _N_COLS))
+    cumulative_survival = 1.0
+    n_run = 0
+
+    for i in range(n):
+        if balance <= 0:
+            break
+        md = marginal_default[i]
+        mp = marginal_prepay[i]
+
+        # Survival entering this month (before any events)
+        survival_entering = cumulative_survival
+
+        # Joint survival: both default and prepayment reduce the surviving pool
+        cumulative_survival *= (1.0 - md) * (1.0 - mp)
+
+        # Scheduled payment (may be less than PMT if balance is small)
+        scheduled = min(pmt, balance * (1.0 + annual_rate / 12.0))
+
+        # Survival-weighted expected payment
+        expected_payment = scheduled * cumulative_survival
+
+        # Net loss from default: ensures default always costs money
+        net_lgd = max(loss_severity[i], 1.0 - recovery_rate[i])
+        expected_loss = md * net_lgd * balance * survival_entering
+        expected_recovery = 0.0
+
+        # Expected prepayment: borrower pays off remaining balance at par
+        expected_prepayment = mp * balance * survival_entering
+
+        # Servicing cost on surviving balance
+        servicing_cost = balance * monthly_servicing * cumulative_survival
+
+        # Net cash flow (prepayment is a positive inflow)
+        net_cf = expected_payment + expected_prepayment - expected_loss + expected_recovery - servicing_cost
+
+        out[i, _SCHEDULED] = scheduled
+        out[i, _SURVIVAL] = cumulative_survival
+        out[i, _EXP_PAYMENT] = expected_payment
+        out[i, _EXP_LOSS] = expected_loss
+        out[i, _EXP_PREPAY] = expected_prepayment
+        out[i, _SERVICING] = servicing_cost
+        out[i, _NET_CF] = net_cf
+        n_run = i + 1
+
+        # Amortize: reduce balance by principal, defaults, and prepayments
+        interest_payment = balance * annual_rate / 12.0
+        principal_payment = scheduled - interest_payment
+        default_reduction = md * balance * survival_entering
+        prepay_reduction = mp * balance * survival_entering
+        balance = max(balance - principal_payment - default_reduction - prepay_reduction, 0.0)
+
+    return out[:n_run]
+
+
+# Order of the per-month multipliers in a stochastic shock array's last axis
+SHOCK_KEYS = ("deq", "default", "recovery", "prepay")
+_SHOCK_DEQ, _SHOCK_DEFAULT, _SHOCK_RECOVERY, _SHOCK_PREPAY = range(4)
+
+
+def _shock(rates: np.ndarray, multipliers: np.ndarray) -> np.ndarray:
+    """Apply multipliers to the leading months of ``rates`` (capped at 1.0).
+
+    ``multipliers`` may be 1-D (one path) or 2-D (paths x months); months
+    beyond the shock horizon are left unshocked.
+    """
+    k = min(multipliers.shape[-1], rates.shape[0])
+    shocked = np.broadcast_to(rates, multipliers.shape[:-1] + rates.shape).copy()
+    shocked[..., :k] = np.minimum(rates[:k] * multipliers[..., :k], 1.0)
+    return shocked
+
+
 def project_cash_flows(
     loan: Loan,
     bucket_id: int,
     scenario: ScenarioParams,
-    stochastic_shocks: list[dict[str, float]] | None = None,
+    stochastic_shocks: list[dict[str, float]] | np.ndarray | None = None,
 ) -> list[MonthlyCashFlow]:
     """Project monthly cash flows for a single loan under a scenario.
 
@@ -39,96 +140,205 @@ def project_cash_flows(
         loan: Loan with balance, rate, terms.
         bucket_id: Risk bucket (1-5).
         scenario: Scenario parameters with stress multipliers.
-        stochastic_shocks: Optional per-month multiplier dicts with keys
-            'deq', 'default', 'recovery' for Monte Carlo perturbation.
+        stochastic_shocks: Optional per-month multipliers for Monte Carlo
+            perturbation — either dicts keyed by SHOCK_KEYS or an
+            (n_months, 4) array with columns in SHOCK_KEYS order.
 
     Returns:
         List of MonthlyCashFlow for each month of remaining term.
     """
-    transitions = get_monthly_transitions(
+    tx = get_monthly_transition_arrays(
         bucket_id, loan.loan_age, loan.remaining_term, scenario,
         loan_rate=loan.interest_rate,
     )
+    months, loss_severity = tx.month, tx.loss_severity
+    marginal_default, marginal_prepay = tx.marginal_default, tx.marginal_prepay
+    deq_rate, recovery_rate = tx.deq_rate, tx.recovery_rate
+
+    # Apply stochastic shocks if provided
+    if stochastic_shocks is not None and len(stochastic_shocks):
+        if not isinstance(stochastic_shocks, np.ndarray):
+            stochastic_shocks = np.array(
+                [[s.get(key, 1.0) for key in SHOCK_KEYS] for s in stochastic_shocks],
+                dtype=np.float64,
+            )
+        marginal_default = _shock(marginal_default, stochastic_shocks[:, _SHOCK_DEFAULT])
+        marginal_prepay = _shock(marginal_prepay, stochastic_shocks[:, _SHOCK_PREPAY])
+        deq_rate = _shock(deq_rate, stochastic_shocks[:, _SHOCK_DEQ])
+        # TODO(Phase 2/3): recovery shock is applied but has no cash effect
+        # under the net-loss framework (expected_recovery=0). Clean up when
+        # LGD/recovery contract is finalized in Phase 0.
+        recovery_rate = _shock(recovery_rate, stochastic_shocks[:, _SHOCK_RECOVERY])
 
     monthly_discount = get_monthly_discount_rate(scenario.coc_scenario)
+    pmt = calculate_monthly_payment(loan.unpaid_balance, loan.interest_rate, loan.remaining_term)
+    return _build_cash_flows(
+        loan, pmt, monthly_discount, months,
+        marginal_default, marginal_prepay, deq_rate, loss_severity, recovery_rate,
+    )
+
+
+def project_cash_flows_multi(
+    loan: Loan,
+    bucket_ids: Sequence[int],
+    scenario: ScenarioParams,
+) -> list[list[MonthlyCashFlow]]:
+    """Deterministic projections of one loan under several risk buckets.
+
+    PMT and the discount rate are computed once; only the transition
+    arrays differ per bucket. Equivalent to calling project_cash_flows
+    for each bucket_id.
+    """
+    monthly_discount = get_monthly_discount_rate(scenario.coc_scenario)
+    pmt = calculate_monthly_payment(loan.unpaid_balance, loan.interest_rate, loan.remaining_term)
+    results: list[list[MonthlyCashFlow]] = []
+    for bucket_id in bucket_ids:
+        tx = get_monthly_transition_arrays(
+            bucket_id, loan.loan_age, loan.remaining_term, scenario,
+            loan_rate=loan.interest_rate,
+        )
+        results.append(_build_cash_flows(
+            loan, pmt, monthly_discount, tx.month,
+            tx.marginal_default, tx.marginal_prepay, tx.deq_rate,
+            tx.loss_severity, tx.recovery_rate,
+        ))
+    return results
+
+
+def _build_cash_flows(
+    loan: Loan,
+    pmt: float,
+    monthly_discount: float,
+    months: np.ndarray,
+    marginal_default: np.ndarray,
+    marginal_prepay: np.ndarray,
+    deq_rate: np.ndarray,
+    loss_severity: np.ndarray,
+    recovery_rate: np.ndarray,
+) -> list[MonthlyCashFlow]:
+    """Run the amortization core and wrap each month in a MonthlyCashFlow."""
     monthly_servicing = _SERVICING_COST_ANNUAL / 12.0
-    balance = loan.unpaid_balance
-    pmt = calculate_monthly_payment(balance, loan.interest_rate, loan.remaining_term)
+    core = _project_core(
+        float(loan.unpaid_balance), float(loan.interest_rate), pmt, monthly_servicing,
+        marginal_default, marginal_prepay, loss_severity, recovery_rate,
+    )
+    n_run = core.shape[0]
+
+    # Discount factor: 1 / (1+r)^t
+    discount_factor = 1.0 / (1.0 + monthly_discount) ** months[:n_run]
+    present_value = core[:, _NET_CF] * discount_factor
 
     cash_flows: list[MonthlyCashFlow] = []
-    cumulative_survival = 1.0
+    for i, row in enumerate(core.tolist()):
+        cash_flows.append(MonthlyCashFlow(
+            month=int(months[i]),
+            scheduled_payment=round(row[_SCHEDULED], 2),
+            survival_probability=round(row[_SURVIVAL], 6),
+            expected_payment=round(row[_EXP_PAYMENT], 2),
+            deq_probability=round(float(deq_rate[i]), 6),
+            default_probability=round(float(marginal_default[i]), 6),
+            expected_loss=round(row[_EXP_LOSS], 2),
+            expected_recovery=0.0,
+            prepay_probability=round(float(marginal_prepay[i]), 6),
+            expected_prepayment=round(row[_EXP_PREPAY], 2),
+            servicing_cost=round(row[_SERVICING], 2),
+            net_cash_flow=round(row[_NET_CF], 2),
+            discount_factor=round(float(discount_factor[i]), 6),
+            present_value=round(float(present_value[i]), 2),
+        ))
 
-    for i, tx in enumerate(transitions):
-        if balance <= 0:
-            break
+    return cash_flows
 
-        # Apply stochastic shocks if provided
-        marginal_default = tx.marginal_default
-        marginal_prepay = tx.marginal_prepay
-        deq_rate = tx.deq_rate
-        recovery_rate = tx.recovery_rate
-        if stochastic_shocks and i < len(stochastic_shocks):
-            shock = stochastic_shocks[i]
-            marginal_default = min(marginal_default * shock.get("default", 1.0), 1.0)
-            marginal_prepay = min(marginal_prepay * shock.get("prepay", 1.0), 1.0)
-            deq_rate = min(deq_rate * shock.get("deq", 1.0), 1.0)
-            # TODO(Phase 2/3): recovery shock is applied but has no cash effect
-            # under the net-loss framework (expected_recovery=0). Clean up when
-            # LGD/recovery contract is finalized in Phase 0.
-            recovery_rate = min(recovery_rate * shock.get("recovery", 1.0), 1.0)
 
-        # Survival entering this month (before any events)
-        survival_entering = cumulative_survival
+@njit(parallel=PARALLEL, cache=True)
+def _mc_cash_flow_matrix(
+    balance: float,
+    annual_rate: float,
+    pmt: float,
+    monthly_servicing: float,
+    md_paths: np.ndarray,
+    mp_paths: np.ndarray,
+    loss_severity: np.ndarray,
+    rr_paths: np.ndarray,
+) -> np.ndarray:
+    """Net cash flow of every path as an (n_months, n_sims) matrix.
 
-        # Joint survival: both default and prepayment reduce the surviving pool
-        cumulative_survival *= (1.0 - marginal_default) * (1.0 - marginal_prepay)
+    Paths are independent, so they run across cores under numba (prange,
+    see _jit.PARALLEL); column j holds path j and months after payoff stay
+    zero. No fastmath — results must match the single-path projection bit
+    for bit.
+    """
+    n_sims, n_months = md_paths.shape
+    cf_matrix = np.zeros((n_months, n_sims))
+    for j in prange(n_sims):
+        core = _project_core(
+            balance, annual_rate, pmt, monthly_servicing,
+            md_paths[j], mp_paths[j], loss_severity, rr_paths[j],
+        )
+        cf_matrix[:core.shape[0], j] = core[:, _NET_CF]
+    return cf_matrix
 
-        # Scheduled payment (may be less than PMT if balance is small)
-        scheduled = min(pmt, balance * (1.0 + loan.interest_rate / 12.0))
 
-        # Survival-weighted expected payment
-        expected_payment = scheduled * cumulative_survival
+def project_mc_present_values(
+    loan: Loan,
+    bucket_id: int,
+    scenario: ScenarioParams,
+    shocks: np.ndarray,
+) -> np.ndarray:
+    """Present value of every Monte Carlo path in one pass.
 
-        # Net loss from default: ensures default always costs money
-        net_lgd = max(tx.loss_severity, 1.0 - recovery_rate)
-        expected_loss = marginal_default * net_lgd * balance * survival_entering
-        expected_recovery = 0.0
+    Equivalent to summing ``present_value`` over ``project_cash_flows`` for
+    each path, but transitions are looked up once and discounting is a
+    single reduction over a (n_months, n_sims) cash-flow matrix.
 
-        # Expected prepayment: borrower pays off remaining balance at par
-        expected_prepayment = marginal_prepay * balance * survival_entering
+    Args:
+        loan: Loan with balance, rate, terms.
+        bucket_id: Risk bucket (1-5).
+        scenario: Scenario parameters with stress multipliers.
+        shocks: (n_sims, n_months, 4) multipliers in SHOCK_KEYS order.
 
-        # Servicing cost on surviving balance
-        servicing_cost = balance * monthly_servicing * cumulative_survival
+    Returns:
+        (n_sims,) array of path PVs, in the same order as ``shocks``.
+    """
+    tx = get_monthly_transition_arrays(
+        bucket_id, loan.loan_age, loan.remaining_term, scenario,
+        loan_rate=loan.interest_rate,
+    )
+    months = tx.month
 
-        # Net cash flow (prepayment is a positive inflow)
-        net_cf = expected_payment + expected_prepayment - expected_loss + expected_recovery - servicing_cost
+    md_paths = _shock(tx.marginal_default, shocks[:, :, _SHOCK_DEFAULT])
+    mp_paths = _shock(tx.marginal_prepay, shocks[:, :, _SHOCK_PREPAY])
+    rr_paths = _shock(tx.recovery_rate, shocks[:, :, _SHOCK_RECOVERY])
 
-        # Discount factor: 1 / (1+r)^t
-        discount_factor = 1.0 / (1.0 + monthly_discount) ** tx.month
-        present_value = net_cf * discount_factor
+    monthly_discount = get_monthly_discount_rate(scenario.coc_scenario)
+    monthly_servicing = _SERVICING_COST_ANNUAL / 12.0
+    balance = float(loan.unpaid_balance)
+    annual_rate = float(loan.interest_rate)
+    pmt = calculate_monthly_payment(balance, annual_rate, loan.remaining_term)
 
-        cash_flows.append(MonthlyCashFlow(
-            month=tx.month,
-            scheduled_payment=round(scheduled, 2),
-            survival_probability=round(cumulative_survival, 6),
-            expected_payment=round(expected_payment, 2),
-            deq_probability=round(deq_rate, 6),
-            default_probability=round(marginal_default, 6),
-            expected_loss=round(expected_loss, 2),
-            expected_recovery=round(expected_recovery, 2),
-            prepay_probability=round(marginal_prepay, 6),
-            expected_prepayment=round(expected_prepayment, 2),
-            servicing_cost=round(servicing_cost, 2),
-            net_cash_flow=round(net_cf, 2),
-            discount_factor=round(discount_factor, 6),
-            present_value=round(present_value, 2),
-        ))
+    cf_matrix = _mc_cash_flow_matrix(
+        balance, annual_rate, pmt, monthly_servicing,
+        md_paths, mp_paths, tx.loss_severity, rr_paths,
+    )
 
-        # Amortize: reduce balance by principal, defaults, and prepayments
-        interest_payment = balance * loan.interest_rate / 12.0
-        principal_payment = scheduled - interest_payment
-        default_reduction = marginal_default * balance * survival_entering
-        prepay_reduction = marginal_prepay * balance * survival_entering
-        balance = max(balance - principal_payment - default_reduction - prepay_reduction, 0.0)
+    discount_factor = 1.0 / (1.0 + monthly_discount) ** months
+    # Discount and round in place: cf_matrix is ours, so the reduction makes
+    # no (n_months, n_sims) temporaries. Per-month PVs are rounded to cents,
+    # matching MonthlyCashFlow.present_value.
+    cf_matrix *= discount_factor[:, None]
+    np.round(cf_matrix, 2, out=cf_matrix)
+    return np.round(cf_matrix.sum(axis=0), 2)
 
-    return cash_flows
+
+def warm_up_kernels() -> None:
+    """Compile (or load from cache) this module's JIT kernels on a one-month dummy loan.
+
+    Covers both _project_core (deterministic projections) and
+    _mc_cash_flow_matrix (MC paths). Called at app startup so the first
+    valuation request doesn't pay numba's compile time; near-free when numba
+    is not installed.
+    """
+    one = np.ones(1)
+    paths = np.full((1, 1), 0.01)
+    _project_core(1000.0, 0.05, 1004.17, 0.0, paths[0], paths[0], one, paths[0])
+    _mc_cash_flow_matrix(1000.0, 0.05, 1004.17, 0.0, paths, paths, one, paths)
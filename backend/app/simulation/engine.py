@@ -9,32 +9,44 @@ import hashlib
 import math
 import random
 
+import numpy as np
+
 from app.models.loan import Loan
 from app.models.simulation import SimulationConfig
 from app.models.valuation import LoanValuationResult
 from app.ml.bucket_assigner import assign_bucket
 from app.ml.model_loader import ModelRegistry
 from app.simulation.scenarios import get_scenario_params
-from app.simulation.cash_flow import project_cash_flows
+from app.simulation.cash_flow import SHOCK_KEYS, project_cash_flows, project_mc_present_values
 
 _MC_SIGMA = 0.15  # Lognormal shock standard deviation
 
 
 def _generate_shocks(
-    n_months: int, rng: random.Random,
-) -> list[dict[str, float]]:
-    """Generate per-month lognormal shock multipliers for MC perturbation."""
-    shocks = []
-    for _ in range(n_months):
-        shocks.append({
-            "deq": math.exp(rng.gauss(0, _MC_SIGMA)),
-            "default": math.exp(rng.gauss(0, _MC_SIGMA)),
-            "recovery": math.exp(rng.gauss(0, _MC_SIGMA)),
-            "prepay": math.exp(rng.gauss(0, _MC_SIGMA)),
-        })
+    n_sims: int, n_months: int, rng: random.Random,
+) -> np.ndarray:
+    """Generate lognormal shock multipliers for MC perturbation.
+
+    Returns an (n_sims, n_months, 4) array in SHOCK_KEYS order. Draws are
+    taken path by path, month by month, so a seeded rng yields the same
+    stream as drawing each path separately.
+    """
+    shocks = np.empty((n_sims, n_months, len(SHOCK_KEYS)))
+    flat = shocks.reshape(-1)
+    for i in range(flat.shape[0]):
+        flat[i] = math.exp(rng.gauss(0, _MC_SIGMA))
     return shocks
 
 
+def _loan_hash(loan_id: str) -> int:
+    """Stable 32-bit hash of a loan_id for per-loan MC seed derivation.
+
+    Reads the low 4 bytes of the SHA-256 digest directly — identical to
+    ``int(hexdigest, 16) & 0xFFFFFFFF`` without the hex round-trip.
+    """
+    return int.from_bytes(hashlib.sha256(loan_id.encode()).digest()[-4:], "big")
+
+
 def _sum_pv(cash_flows) -> float:
     """Sum present values from a list of MonthlyCashFlow."""
     return sum(cf.present_value for cf in cash_flows)
@@ -70,16 +82,14 @@ def simulate_loan(loan: Loan, config: SimulationConfig) -> LoanValuationResult:
             if config.include_stochastic and config.n_simulations > 0:
                 if config.stochastic_seed is not None:
                     base_seed = config.stochastic_seed
-                    loan_hash = int(hashlib.sha256(loan.loan_id.encode()).hexdigest(), 16) & 0xFFFFFFFF
-                    seed = (base_seed + loan_hash) & 0xFFFFFFFF
+                    seed = (base_seed + _loan_hash(loan.loan_id)) & 0xFFFFFFFF
                     rng = random.Random(seed)
                 else:
                     rng = random.Random()
 
-                for _ in range(config.n_simulations):
-                    shocks = _generate_shocks(loan.remaining_term, rng)
-                    mc_cfs = project_cash_flows(loan, bucket_id, scenario, shocks)
-                    all_mc_pvs.append(round(_sum_pv(mc_cfs), 2))
+                shocks = _generate_shocks(config.n_simulations, loan.remaining_term, rng)
+                # Path order is preserved — pv_distribution is not sorted
+                all_mc_pvs = project_mc_present_values(loan, bucket_id, scenario, shocks).tolist()
 
     # Percentiles computed from sorted copy; raw order preserved for portfolio aggregation
     sorted_pvs = sorted(all_mc_pvs)
@@ -6,6 +6,9 @@ from the ML stub models, applying scenario stress multipliers.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
 
 from app.ml.curve_provider import get_survival_curve
 from app.ml.stub_deq import get_deq_rate
@@ -27,56 +30,74 @@ class MonthlyTransition:
     recovery_rate: float
 
 
-def get_monthly_transitions(
+class MonthlyTransitionArrays(NamedTuple):
+    """Column-oriented form of a loan's transition vector — one array per field."""
+    month: np.ndarray
+    survival_prob: np.ndarray
+    marginal_default: np.ndarray
+    marginal_prepay: np.ndarray
+    deq_rate: np.ndarray
+    loss_severity: np.ndarray
+    recovery_rate: np.ndarray
+
+
+def get_monthly_transition_arrays(
     bucket_id: int,
     loan_age: int,
     remaining_term: int,
     scenario: ScenarioParams,
     loan_rate: float = 0.065,
-) -> list[MonthlyTransition]:
-    """Build per-month transition vector for a loan.
+) -> MonthlyTransitionArrays:
+    """Build the per-month transition vector for a loan as NumPy arrays.
 
     Uses the survival curve to derive marginal default hazard:
         h(t) = 1 - S(t)/S(t-1)
     Then applies scenario stress multipliers to DEQ, default, and recovery.
     """
-    curve = get_survival_curve(bucket_id, remaining_term)
+    curve = np.asarray(get_survival_curve(bucket_id, remaining_term), dtype=np.float64)
     base_loss_severity = get_loss_severity(bucket_id)
     base_recovery = get_recovery_rate(bucket_id)
+    ages = loan_age + np.arange(remaining_term)
+
+    # Survival and marginal default from curve
+    s_prev = np.concatenate(([1.0], curve[:-1]))[:remaining_term]
+    # NOTE: KM survival captures all exits (default + prepay + payoff).
+    # marginal_default here is the all-causes hazard from KM, not pure default.
+    # This is an interim approach; Phase 3 will implement proper competing risks.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        marginal_default = np.where(s_prev > 0, np.maximum(1.0 - curve / s_prev, 0.0), 0.0)
+
+    # DEQ rate and prepayment hazard from stub models
+    deq = get_deq_rate(bucket_id, ages)
+    base_prepay = get_prepay_hazard(bucket_id, ages, loan_rate)
+
+    # Apply scenario stress multipliers
+    stressed_recovery = min(base_recovery * scenario.recovery_multiplier, 1.0)
+
+    return MonthlyTransitionArrays(
+        month=np.arange(1, remaining_term + 1, dtype=np.int32),
+        survival_prob=curve,
+        marginal_default=np.minimum(marginal_default * scenario.default_multiplier, 1.0),
+        marginal_prepay=np.minimum(base_prepay * scenario.prepayment_multiplier, 1.0),
+        deq_rate=np.minimum(deq * scenario.deq_multiplier, 1.0),
+        loss_severity=np.full(remaining_term, base_loss_severity, dtype=np.float64),
+        recovery_rate=np.full(remaining_term, stressed_recovery, dtype=np.float64),
+    )
+
 
-    transitions: list[MonthlyTransition] = []
-    for m in range(remaining_term):
-        month_num = m + 1
-        current_age = loan_age + m
-
-        # Survival and marginal default from curve
-        s_curr = curve[m]
-        s_prev = curve[m - 1] if m > 0 else 1.0
-        # NOTE: KM survival captures all exits (default + prepay + payoff).
-        # marginal_default here is the all-causes hazard from KM, not pure default.
-        # This is an interim approach; Phase 3 will implement proper competing risks.
-        marginal_default = max(1.0 - s_curr / s_prev, 0.0) if s_prev > 0 else 0.0
-
-        # DEQ rate from stub model
-        deq = get_deq_rate(bucket_id, current_age)
-
-        # Prepayment hazard from stub model
-        base_prepay = get_prepay_hazard(bucket_id, current_age, loan_rate)
-
-        # Apply scenario stress multipliers
-        stressed_default = min(marginal_default * scenario.default_multiplier, 1.0)
-        stressed_deq = min(deq * scenario.deq_multiplier, 1.0)
-        stressed_recovery = min(base_recovery * scenario.recovery_multiplier, 1.0)
-        stressed_prepay = min(base_prepay * scenario.prepayment_multiplier, 1.0)
-
-        transitions.append(MonthlyTransition(
-            month=month_num,
-            survival_prob=s_curr,
-            marginal_default=stressed_default,
-            marginal_prepay=stressed_prepay,
-            deq_rate=stressed_deq,
-            loss_severity=base_loss_severity,
-            recovery_rate=stressed_recovery,
-        ))
-
-    return transitions
+def get_monthly_transitions(
+    bucket_id: int,
+    loan_age: int,
+    remaining_term: int,
+    scenario: ScenarioParams,
+    loan_rate: float = 0.065,
+) -> list[MonthlyTransition]:
+    """Build per-month transition vector for a loan.
+
+    Row-oriented view of get_monthly_transition_arrays, one
+    MonthlyTransition per month.
+    """
+    arrays = get_monthly_transition_arrays(
+        bucket_id, loan_age, remaining_term, scenario, loan_rate=loan_rate,
+    )
+    return [MonthlyTransition(*row) for row in zip(*(col.tolist() for col in arrays))]
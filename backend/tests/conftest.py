@@ -1,6 +1,109 @@
+import json
 import sys
+from pathlib import Path
 from unittest.mock import MagicMock
 
+import pytest
+
 # Mock pyodbc so tests can run without ODBC drivers installed
 if "pyodbc" not in sys.modules:
     sys.modules["pyodbc"] = MagicMock()
+
+from app.simulation._jit import configure_threading_layer  # noqa: E402
+from app.simulation.scenarios import get_scenario_params, list_scenario_names  # noqa: E402
+
+# Same as the app lifespan, but before any test can launch a prange kernel
+configure_threading_layer()
+
+GOLDENS_DIR = Path(__file__).parent / "goldens"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--regen-goldens", action="store_true", default=False,
+        help="Recompute golden results from the engine and rewrite tests/goldens/",
+    )
+    parser.addoption(
+        "--full-xlsx", action="store_true", default=False,
+        help="Also run upload tests against workbooks written by openpyxl",
+    )
+    parser.addoption(
+        "--fast", action="store_true", default=False,
+        help="Stub the Monte Carlo path PVs and skip tests marked slow",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("--fast"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow: runs without --fast")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_mc(request):
+    """Under --fast, replace the engine's MC path PVs with canned values.
+
+    Session-scoped so module fixtures that value packages see the stub too.
+    Result shapes are unchanged — one PV per path, in path order — so schema
+    tests still run; anything asserting on real MC values must be marked slow.
+    """
+    if not request.config.getoption("--fast"):
+        yield
+        return
+
+    import numpy as np
+
+    def canned_pvs(loan, bucket_id, scenario, shocks):
+        return np.round(loan.unpaid_balance * (1.0 + np.linspace(-0.1, 0.1, len(shocks))), 2)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.simulation.engine.project_mc_present_values", canned_pvs)
+        yield
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Shared TestClient — lifespan (DB pool + model load) runs once per session.
+
+    FastAPI and app.main are imported here rather than at module scope so a
+    filtered run that never requests ``client`` skips the app import entirely.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as c:
+        c.get("/api/health")  # warmup: first request resolves routes + registry
+        yield c
+
+
+@pytest.fixture(scope="session")
+def scenarios():
+    """All named ScenarioParams, keyed by scenario name."""
+    return {name: get_scenario_params(name) for name in list_scenario_names()}
+
+
+@pytest.fixture(scope="session")
+def golden_or_compute(request):
+    """Load ``tests/goldens/<key>.json``; with --regen-goldens, recompute and rewrite it.
+
+    Usage: ``golden_or_compute("key", compute_fn)`` where compute_fn returns
+    a JSON-serializable dict.
+    """
+    regen = request.config.getoption("--regen-goldens")
+
+    def _golden(key, compute_fn):
+        path = GOLDENS_DIR / f"{key}.json"
+        if regen:
+            data = compute_fn()
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+            return data
+        if not path.is_file():
+            pytest.fail(f"Missing golden {path.name} — run pytest --regen-goldens")
+        return json.loads(path.read_text())
+
+    return _golden
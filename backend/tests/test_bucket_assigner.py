@@ -4,6 +4,8 @@ import pytest
 from app.ml.model_loader import ModelRegistry
 from app.ml.bucket_assigner import assign_bucket
 
+pytestmark = pytest.mark.xdist_group("registry")
+
 
 @pytest.fixture(autouse=True)
 def _reset_registry():
@@ -1,9 +1,12 @@
 """Tests for curve_provider — stub curves: length, monotonicity, ordering."""
+import numpy as np
 import pytest
 
 from app.ml.model_loader import ModelRegistry
 from app.ml.curve_provider import get_survival_curve
 
+pytestmark = pytest.mark.xdist_group("registry")
+
 
 @pytest.fixture(autouse=True)
 def _reset_registry():
@@ -50,9 +53,17 @@ def test_stub_curve_reasonable_values():
         assert all(0 <= p <= 1.0 for p in curve)
 
 
+def test_stub_curve_matches_exponential_survival():
+    """Stub curve is S(t) = exp(-h*t/12) for t = 1..n, evaluated as one array."""
+    months = np.arange(1, 361)
+    for bid, annual_hazard in [(1, 0.005), (3, 0.020), (5, 0.070)]:
+        np.testing.assert_allclose(
+            get_survival_curve(bid), np.exp(-annual_hazard / 12 * months), rtol=1e-15,
+        )
+
+
 def test_loaded_curves_take_precedence(tmp_path):
     """When parquet data is loaded, it's used instead of stubs."""
-    import math
     try:
         import pyarrow as pa
         import pyarrow.parquet as pq
@@ -62,13 +73,12 @@ def test_loaded_curves_take_precedence(tmp_path):
     survival_dir = tmp_path / "survival"
     survival_dir.mkdir()
     # Create a tiny parquet with only bucket 1, 10 months
-    bucket_ids = [1] * 10
-    months = list(range(1, 11))
-    probs = [math.exp(-0.001 * m) for m in months]
+    months = np.arange(1, 11, dtype=np.int32)
+    probs = np.exp(-0.001 * months)
     table = pa.table({
-        "bucket_id": pa.array(bucket_ids, type=pa.int32()),
-        "month": pa.array(months, type=pa.int32()),
-        "survival_prob": pa.array(probs, type=pa.float64()),
+        "bucket_id": pa.array(np.ones(10, dtype=np.int32)),
+        "month": pa.array(months),
+        "survival_prob": pa.array(probs),
     })
     pq.write_table(table, str(survival_dir / "survival_curves.parquet"))
 
@@ -78,5 +88,4 @@ def test_loaded_curves_take_precedence(tmp_path):
     curve = get_survival_curve(1, n_months=10)
     assert len(curve) == 10
     # Values should match what we wrote
-    for i, expected in enumerate(probs):
-        assert abs(curve[i] - expected) < 1e-10
+    np.testing.assert_allclose(curve, probs, rtol=0, atol=1e-10)
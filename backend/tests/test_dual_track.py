@@ -3,9 +3,8 @@
 Covers Track A valuation, Track B provenance, dual-track calibration,
 and API endpoint behavior.
 """
-from fastapi.testclient import TestClient
+import numpy as np
 
-from app.main import app
 from app.models.loan import Loan
 from app.models.package import Package
 from app.models.simulation import SimulationConfig, TrackAConfig, ValuationTrack
@@ -18,8 +17,6 @@ from app.services.calibration_service import (
 from app.services.dual_track_service import valuate_loan, valuate_package
 from app.services.track_a_valuation import track_a_loan_pv, valuate_loan_track_a, valuate_package_track_a
 
-client = TestClient(app)
-
 
 def _make_loan(**overrides) -> Loan:
     defaults = dict(
@@ -39,12 +36,14 @@ def _make_loan(**overrides) -> Loan:
 def _make_package(loans=None) -> Package:
     if loans is None:
         loans = [_make_loan()]
+    upbs = np.fromiter((l.unpaid_balance for l in loans), dtype=np.float64, count=len(loans))
+    total_upb = float(upbs.sum())
     return Package(
         package_id="PKG-DT01",
         name="Dual Track Test",
         loan_count=len(loans),
-        total_upb=sum(l.unpaid_balance for l in loans),
-        purchase_price=sum(l.unpaid_balance for l in loans) * 0.95,
+        total_upb=total_upb,
+        purchase_price=total_upb * 0.95,
         loans=loans,
     )
 
@@ -346,7 +345,7 @@ _SAMPLE_PACKAGE = {
 }
 
 
-def test_valuation_track_a_returns_200():
+def test_valuation_track_a_returns_200(client):
     response = client.post("/api/valuations/run", json={
         "package": _SAMPLE_PACKAGE,
         "config": {
@@ -361,7 +360,7 @@ def test_valuation_track_a_returns_200():
     assert data["provenance"]["track"] == "A"
 
 
-def test_valuation_track_both_returns_200():
+def test_valuation_track_both_returns_200(client):
     response = client.post("/api/valuations/run", json={
         "package": _SAMPLE_PACKAGE,
         "config": {
@@ -377,7 +376,7 @@ def test_valuation_track_both_returns_200():
     assert data["tolerance_gate_passed"] is not None
 
 
-def test_valuation_default_track_backward_compatible():
+def test_valuation_default_track_backward_compatible(client):
     """Default request (no track specified) should still work as Track B."""
     response = client.post("/api/valuations/run", json={
         "package": _SAMPLE_PACKAGE,
@@ -1,11 +1,4 @@
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-client = TestClient(app)
-
-
-def test_health_returns_200():
+def test_health_returns_200(client):
     response = client.get("/api/health")
     assert response.status_code == 200
     data = response.json()
@@ -15,7 +8,7 @@ def test_health_returns_200():
     assert data["models"]["status"] in ("loaded", "not_loaded")
 
 
-def test_model_status_returns_200():
+def test_model_status_returns_200(client):
     response = client.get("/api/models/status")
     assert response.status_code == 200
     data = response.json()
@@ -24,8 +17,3 @@ def test_model_status_returns_200():
         assert "models" in data
         for name in ("survival", "deq", "default", "recovery", "prepayment"):
             assert name in data["models"]
-
-
-def test_valuation_no_body_returns_422():
-    response = client.post("/api/valuations/run")
-    assert response.status_code == 422
@@ -4,17 +4,23 @@ Covers probability bounds, accounting identities, scenario monotonicity,
 MC reproducibility, and portfolio aggregation correctness.
 """
 import hashlib
+from math import isclose
+
+import numpy as np
+import pytest
 
 from app.models.loan import Loan
 from app.models.package import Package
 from app.models.simulation import SimulationConfig
-from app.simulation.cash_flow import project_cash_flows
-from app.simulation.engine import simulate_loan
-from app.simulation.scenarios import get_scenario_params
-from app.simulation.state_transitions import get_monthly_transitions
+from app.simulation.cash_flow import project_cash_flows, project_cash_flows_multi
+from app.simulation.engine import _loan_hash, simulate_loan
+from app.simulation.state_transitions import get_monthly_transition_arrays
 from app.services.simulation_service import run_valuation
 
 
+_SCENARIO_NAMES = ["baseline", "mild_recession", "severe_recession"]
+
+
 def _make_loan(**overrides) -> Loan:
     defaults = dict(
         loan_id="INV001",
@@ -30,15 +36,28 @@ def _make_loan(**overrides) -> Loan:
     return Loan(**defaults)
 
 
+def _baseline_120mo_pvs() -> dict:
+    """Deterministic 3-scenario PVs of a 120-month loan."""
+    config = SimulationConfig(n_simulations=0, include_stochastic=False)
+    result = simulate_loan(_make_loan(remaining_term=120), config)
+    return {"expected_pv": result.expected_pv, "pv_by_scenario": result.pv_by_scenario}
+
+
+@pytest.fixture(scope="module")
+def baseline_120mo_golden(golden_or_compute):
+    """Pinned _baseline_120mo_pvs() output (tests/goldens/baseline_120mo.json)."""
+    return golden_or_compute("baseline_120mo", _baseline_120mo_pvs)
+
+
 # ---------------------------------------------------------------------------
 # Probability invariants
 # ---------------------------------------------------------------------------
 
 
-def test_survival_monotonically_decreasing():
+def test_survival_monotonically_decreasing(scenarios):
     """S(t) >= S(t+1) for all t."""
     loan = _make_loan(remaining_term=120)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 3, scenario)
     for i in range(1, len(cfs)):
         assert cfs[i].survival_probability <= cfs[i - 1].survival_probability, (
@@ -47,58 +66,53 @@ def test_survival_monotonically_decreasing():
         )
 
 
-def test_survival_bounded_0_1():
+@pytest.mark.parametrize("scenario_name", _SCENARIO_NAMES, ids=str)
+def test_survival_bounded_0_1(scenarios, scenario_name):
     """0 <= S(t) <= 1 for all t."""
     loan = _make_loan(remaining_term=120)
-    for scenario_name in ["baseline", "mild_recession", "severe_recession"]:
-        scenario = get_scenario_params(scenario_name)
-        cfs = project_cash_flows(loan, 3, scenario)
-        for cf in cfs:
-            assert 0.0 <= cf.survival_probability <= 1.0, (
-                f"Survival out of bounds at month {cf.month} "
-                f"under {scenario_name}: {cf.survival_probability}"
-            )
+    cfs = project_cash_flows(loan, 3, scenarios[scenario_name])
+    for cf in cfs:
+        assert 0.0 <= cf.survival_probability <= 1.0, (
+            f"Survival out of bounds at month {cf.month}: {cf.survival_probability}"
+        )
 
 
-def test_marginal_hazard_bounded_0_1():
+def test_marginal_hazard_bounded_0_1(scenarios):
     """0 <= h(t) <= 1 for marginal default hazard."""
-    scenario = get_scenario_params("severe_recession")
-    transitions = get_monthly_transitions(5, 0, 360, scenario)
-    for tx in transitions:
-        assert 0.0 <= tx.marginal_default <= 1.0, (
-            f"Marginal default out of [0,1] at month {tx.month}: {tx.marginal_default}"
-        )
+    scenario = scenarios["severe_recession"]
+    tx = get_monthly_transition_arrays(5, 0, 360, scenario)
+    bad = (tx.marginal_default < 0.0) | (tx.marginal_default > 1.0)
+    assert not bad.any(), (
+        f"Marginal default out of [0,1] at months {tx.month[bad].tolist()}: "
+        f"{tx.marginal_default[bad].tolist()}"
+    )
 
 
-def test_cumulative_survival_consistent_with_marginals():
+def test_cumulative_survival_consistent_with_marginals(scenarios):
     """Product of (1 - h_default(t)) * (1 - h_prepay(t)) should approximate
     the cumulative survival used in cash_flow."""
     loan = _make_loan(remaining_term=60)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 3, scenario)
-    transitions = get_monthly_transitions(3, loan.loan_age, loan.remaining_term, scenario,
-                                          loan_rate=loan.interest_rate)
-    product = 1.0
-    for i, tx in enumerate(transitions):
-        if i >= len(cfs):
-            break
-        product *= (1.0 - tx.marginal_default) * (1.0 - tx.marginal_prepay)
-        assert abs(product - cfs[i].survival_probability) < 1e-4, (
-            f"Survival mismatch at month {tx.month}: "
-            f"product={product:.6f}, cf={cfs[i].survival_probability:.6f}"
-        )
+    tx = get_monthly_transition_arrays(3, loan.loan_age, loan.remaining_term, scenario,
+                                       loan_rate=loan.interest_rate)
+    product = np.cumprod((1.0 - tx.marginal_default) * (1.0 - tx.marginal_prepay))
+    surv = np.fromiter((cf.survival_probability for cf in cfs), dtype=np.float64, count=len(cfs))
+    np.testing.assert_allclose(
+        product[:len(surv)], surv, rtol=0, atol=1e-4,
+        err_msg="Cumulative survival diverges from product of marginals",
+    )
 
 
-def test_prepay_rate_bounded():
+@pytest.mark.parametrize("scenario_name", _SCENARIO_NAMES, ids=str)
+def test_prepay_rate_bounded(scenarios, scenario_name):
     """0 <= SMM(t) <= 1 for all months and scenarios."""
-    for scenario_name in ["baseline", "mild_recession", "severe_recession"]:
-        scenario = get_scenario_params(scenario_name)
-        transitions = get_monthly_transitions(3, 60, 120, scenario)
-        for tx in transitions:
-            assert 0.0 <= tx.marginal_prepay <= 1.0, (
-                f"Prepay rate out of [0,1] at month {tx.month} "
-                f"under {scenario_name}: {tx.marginal_prepay}"
-            )
+    tx = get_monthly_transition_arrays(3, 60, 120, scenarios[scenario_name])
+    bad = (tx.marginal_prepay < 0.0) | (tx.marginal_prepay > 1.0)
+    assert not bad.any(), (
+        f"Prepay rate out of [0,1] at months {tx.month[bad].tolist()}: "
+        f"{tx.marginal_prepay[bad].tolist()}"
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -106,41 +120,42 @@ def test_prepay_rate_bounded():
 # ---------------------------------------------------------------------------
 
 
-def test_net_cf_equals_components():
+def test_net_cf_equals_components(scenarios):
     """net_cf == payment + prepay - loss + recovery - servicing."""
     loan = _make_loan(remaining_term=60)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 3, scenario)
     for cf in cfs:
         expected = (cf.expected_payment + cf.expected_prepayment
                     - cf.expected_loss + cf.expected_recovery
                     - cf.servicing_cost)
-        assert abs(cf.net_cash_flow - round(expected, 2)) <= 0.02, (
+        assert isclose(cf.net_cash_flow, expected, abs_tol=0.02), (
             f"Net CF mismatch at month {cf.month}: "
             f"net_cf={cf.net_cash_flow}, components={expected:.2f}"
         )
 
 
-def test_no_gain_from_default():
+def test_no_gain_from_default(scenarios):
     """Under net-loss framework, expected_loss >= 0 and expected_recovery == 0."""
     loan = _make_loan(remaining_term=60)
-    for bucket_id in range(1, 6):
-        scenario = get_scenario_params("baseline")
-        cfs = project_cash_flows(loan, bucket_id, scenario)
-        for cf in cfs:
-            assert cf.expected_loss >= 0.0, (
-                f"Negative expected_loss at month {cf.month}, bucket {bucket_id}"
-            )
-            assert cf.expected_recovery == 0.0, (
-                f"Non-zero expected_recovery at month {cf.month}, bucket {bucket_id}: "
-                f"{cf.expected_recovery}"
-            )
-
-
-def test_balance_decline_monotonic():
+    bucket_ids = range(1, 6)
+    results = project_cash_flows_multi(loan, bucket_ids, scenarios["baseline"])
+    for bucket_id, cfs in zip(bucket_ids, results):
+        losses = np.fromiter((cf.expected_loss for cf in cfs), dtype=np.float64, count=len(cfs))
+        recoveries = np.fromiter((cf.expected_recovery for cf in cfs), dtype=np.float64, count=len(cfs))
+        assert (losses >= 0.0).all(), (
+            f"Negative expected_loss in bucket {bucket_id} at months "
+            f"{[cf.month for cf, loss in zip(cfs, losses) if loss < 0.0]}"
+        )
+        assert (recoveries == 0.0).all(), (
+            f"Non-zero expected_recovery in bucket {bucket_id}: {recoveries[recoveries != 0.0].tolist()}"
+        )
+
+
+def test_balance_decline_monotonic(scenarios):
     """Remaining balance never increases over time."""
     loan = _make_loan(remaining_term=120)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 3, scenario)
     # Track balance decline via scheduled_payment and survival
     # The simplest proxy: survival-weighted expected_payment should be non-negative
@@ -149,12 +164,12 @@ def test_balance_decline_monotonic():
         assert cf.expected_prepayment >= 0.0
 
 
-def test_terminal_balance_near_zero():
+def test_terminal_balance_near_zero(scenarios):
     """For a full-term loan under baseline, the cash flow projection should
     terminate before the full remaining term (balance amortizes to zero via
     principal, defaults, and prepayments)."""
     loan = _make_loan(remaining_term=360, loan_age=0)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 1, scenario)
     # Cash flows should terminate well before 360 months because defaults
     # and prepayments deplete the balance to zero
@@ -173,27 +188,35 @@ def test_terminal_balance_near_zero():
 # ---------------------------------------------------------------------------
 
 
-def test_severe_npv_le_mild_le_baseline():
+def test_severe_npv_le_mild_le_baseline(baseline_120mo_golden):
     """NPV should decrease with stress: baseline >= mild >= severe."""
-    loan = _make_loan(remaining_term=120)
-    config = SimulationConfig(n_simulations=0, include_stochastic=False)
-    result = simulate_loan(loan, config)
-    baseline = result.pv_by_scenario["baseline"]
-    mild = result.pv_by_scenario["mild_recession"]
-    severe = result.pv_by_scenario["severe_recession"]
+    pvs = baseline_120mo_golden["pv_by_scenario"]
+    baseline = pvs["baseline"]
+    mild = pvs["mild_recession"]
+    severe = pvs["severe_recession"]
     assert baseline >= mild, f"baseline ({baseline}) < mild ({mild})"
     assert mild >= severe, f"mild ({mild}) < severe ({severe})"
 
 
-def test_scenario_spread_positive():
+def test_scenario_spread_positive(baseline_120mo_golden):
     """Baseline - severe > 0 (stress always costs value)."""
-    loan = _make_loan(remaining_term=120)
-    config = SimulationConfig(n_simulations=0, include_stochastic=False)
-    result = simulate_loan(loan, config)
-    spread = result.pv_by_scenario["baseline"] - result.pv_by_scenario["severe_recession"]
+    pvs = baseline_120mo_golden["pv_by_scenario"]
+    spread = pvs["baseline"] - pvs["severe_recession"]
     assert spread > 0, f"Non-positive scenario spread: {spread}"
 
 
+def test_baseline_120mo_engine_matches_golden(baseline_120mo_golden):
+    """End-to-end: the live engine still reproduces the pinned scenario PVs."""
+    live = _baseline_120mo_pvs()
+    assert isclose(live["expected_pv"], baseline_120mo_golden["expected_pv"], abs_tol=0.01)
+    assert live["pv_by_scenario"].keys() == baseline_120mo_golden["pv_by_scenario"].keys()
+    for name, pv in live["pv_by_scenario"].items():
+        golden = baseline_120mo_golden["pv_by_scenario"][name]
+        assert isclose(pv, golden, abs_tol=0.01), (
+            f"{name}: engine PV {pv} != golden {golden} — rerun with --regen-goldens if intended"
+        )
+
+
 # ---------------------------------------------------------------------------
 # Reproducibility
 # ---------------------------------------------------------------------------
@@ -202,18 +225,43 @@ def test_scenario_spread_positive():
 def test_hash_deterministic_across_calls():
     """SHA-256 hash of loan_id produces identical seed across calls."""
     loan_id = "LOAN_DETERM_001"
-    h1 = int(hashlib.sha256(loan_id.encode()).hexdigest(), 16) & 0xFFFFFFFF
-    h2 = int(hashlib.sha256(loan_id.encode()).hexdigest(), 16) & 0xFFFFFFFF
-    assert h1 == h2
+    assert _loan_hash(loan_id) == _loan_hash(loan_id)
+    # Same seed as the original hexdigest-based derivation
+    legacy = int(hashlib.sha256(loan_id.encode()).hexdigest(), 16) & 0xFFFFFFFF
+    assert _loan_hash(loan_id) == legacy
 
 
-def test_mc_results_reproducible():
-    """Two simulate_loan() calls with same seed produce identical pv_distribution."""
+# blake2b of the seeded 20-path distribution below. If this changes, seeded MC
+# output changed — confirm the change is intended before updating it.
+_MC_DISTRIBUTION_DIGEST = "41b01a3f44bd33f7d2ec1e826df72f81"
+
+
+def _distribution_digest(pvs: list[float]) -> str:
+    """blake2b fingerprint of a pv_distribution's float64 bytes."""
+    return hashlib.blake2b(np.asarray(pvs, dtype=np.float64).tobytes(), digest_size=16).hexdigest()
+
+
+@pytest.mark.slow
+def test_mc_deterministic_hash():
+    """Seeded pv_distribution matches the pinned digest (one MC run)."""
     loan = _make_loan(remaining_term=60)
     config = SimulationConfig(n_simulations=20, include_stochastic=True, stochastic_seed=12345)
+    result = simulate_loan(loan, config)
+    assert _distribution_digest(result.pv_distribution) == _MC_DISTRIBUTION_DIGEST, (
+        "Seeded MC distribution changed"
+    )
+
+
+@pytest.mark.slow
+def test_mc_seed_reproducibility_smoke():
+    """Two simulate_loan() calls with same seed produce identical pv_distribution."""
+    loan = _make_loan(remaining_term=60)
+    config = SimulationConfig(n_simulations=2, include_stochastic=True, stochastic_seed=12345)
     r1 = simulate_loan(loan, config)
     r2 = simulate_loan(loan, config)
-    assert r1.pv_distribution == r2.pv_distribution, "MC distributions differ across runs"
+    assert _distribution_digest(r1.pv_distribution) == _distribution_digest(r2.pv_distribution), (
+        "MC distributions differ across runs"
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -229,11 +277,6 @@ def test_portfolio_npv_sum_of_parts():
     ]
     config = SimulationConfig(n_simulations=0, include_stochastic=False)
 
-    individual_pvs = []
-    for loan in loans:
-        result = simulate_loan(loan, config)
-        individual_pvs.append(result.pv_by_scenario["baseline"])
-
     package = Package(
         package_id="PKG001",
         name="Test Package",
@@ -243,7 +286,11 @@ def test_portfolio_npv_sum_of_parts():
     )
     pkg_result = run_valuation(package, config)
 
-    assert abs(pkg_result.npv_by_scenario["baseline"] - sum(individual_pvs)) < 0.02, (
+    # Per-loan PVs come back on loan_results — no need to re-simulate each loan
+    assert [lr.loan_id for lr in pkg_result.loan_results] == ["AGG001", "AGG002"]
+    individual_pvs = [lr.pv_by_scenario["baseline"] for lr in pkg_result.loan_results]
+
+    assert isclose(pkg_result.npv_by_scenario["baseline"], sum(individual_pvs), abs_tol=0.02), (
         f"Portfolio NPV ({pkg_result.npv_by_scenario['baseline']}) != "
         f"sum of parts ({sum(individual_pvs)})"
     )
@@ -281,7 +328,7 @@ def test_track_a_net_cf_equals_components():
         expected = (cf.expected_payment + cf.expected_prepayment
                     - cf.expected_loss + cf.expected_recovery
                     - cf.servicing_cost)
-        assert abs(cf.net_cash_flow - round(expected, 2)) <= 0.02, (
+        assert isclose(cf.net_cash_flow, expected, abs_tol=0.02), (
             f"Track A net CF mismatch at month {cf.month}: "
             f"net_cf={cf.net_cash_flow}, components={expected:.2f}"
         )
@@ -325,21 +372,18 @@ def test_provenance_always_present_when_track_set():
         )
 
 
+@pytest.mark.slow
 def test_mc_distribution_not_sorted():
     """pv_distribution preserves simulation-path insertion order, not sorted order.
 
-    Deterministic check: run the same loan twice with fixed seed, confirm both
-    return identical ordering (proving it's deterministic) and that the ordering
-    differs from sorted (proving the engine isn't sorting).
+    Determinism is covered by test_mc_deterministic_hash and
+    test_mc_seed_reproducibility_smoke; here one seeded run must differ from
+    its sorted order (proving the engine isn't sorting).
     """
     loan = _make_loan(loan_id="UNSORT001", remaining_term=60)
     config = SimulationConfig(n_simulations=50, include_stochastic=True, stochastic_seed=42)
 
     r1 = simulate_loan(loan, config)
-    r2 = simulate_loan(loan, config)
-
-    # Deterministic: same inputs → same path-ordered output
-    assert r1.pv_distribution == r2.pv_distribution
 
     # Structural: raw order differs from sorted order
     assert r1.pv_distribution != sorted(r1.pv_distribution), (
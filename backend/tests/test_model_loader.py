@@ -1,10 +1,11 @@
 """Tests for model_loader — ModelRegistry, ModelManifest."""
-import json
-
+import orjson
 import pytest
 
 from app.ml.model_loader import ModelManifest, ModelRegistry
 
+pytestmark = pytest.mark.xdist_group("registry")
+
 
 @pytest.fixture(autouse=True)
 def _reset_registry():
@@ -34,7 +35,7 @@ def test_registry_loads_manifest(tmp_path):
             "deq": {"status": "stub", "path": "deq/"},
         },
     }
-    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    (tmp_path / "manifest.json").write_bytes(orjson.dumps(manifest))
     reg = ModelRegistry.get()
     reg.load(tmp_path)
 
@@ -54,7 +55,7 @@ def test_registry_loads_bucket_definitions(tmp_path):
             {"bucket_id": 2, "label": "B", "rules": []},
         ]
     }
-    (survival_dir / "bucket_definitions.json").write_text(json.dumps(defs))
+    (survival_dir / "bucket_definitions.json").write_bytes(orjson.dumps(defs))
     reg = ModelRegistry.get()
     reg.load(tmp_path)
 
@@ -62,6 +63,19 @@ def test_registry_loads_bucket_definitions(tmp_path):
     assert reg.bucket_definitions[0]["label"] == "A"
 
 
+def test_registry_loads_json_with_nan_literals(tmp_path):
+    """Artifacts written by json.dumps may contain NaN, which orjson rejects."""
+    survival_dir = tmp_path / "survival"
+    survival_dir.mkdir()
+    (survival_dir / "bucket_definitions.json").write_text(
+        '{"buckets": [{"bucket_id": 1, "label": "A", "rules": [], "score": NaN}]}'
+    )
+    reg = ModelRegistry.get()
+    reg.load(tmp_path)
+
+    assert reg.bucket_definitions[0]["label"] == "A"
+
+
 def test_get_status_not_loaded():
     """Status is not_loaded before load() is called."""
     reg = ModelRegistry.get()
@@ -91,7 +105,7 @@ def test_get_status_loaded_with_manifest(tmp_path):
             "recovery": {"status": "stub", "path": "recovery/"},
         },
     }
-    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    (tmp_path / "manifest.json").write_bytes(orjson.dumps(manifest))
     reg = ModelRegistry.get()
     reg.load(tmp_path)
     status = reg.get_status()
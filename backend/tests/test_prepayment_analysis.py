@@ -1,23 +1,24 @@
 """Tests for the APEX2 prepayment analysis service and endpoint."""
 import math
 
+import numpy as np
+import orjson
 import pytest
-from fastapi.testclient import TestClient
 
-from app.main import app
+from app.models.loan import Loan
 from app.models.package import Package
 from app.models.prepayment import PrepaymentConfig
 from app.services.prepayment_analysis import (
     apex2_amortize,
+    apex2_amortize_batch,
     compute_apex2_multiplier,
     compute_pandi,
     get_credit_band,
     project_effective_life,
+    project_effective_life_batch,
     run_prepayment_analysis,
 )
 
-client = TestClient(app)
-
 _SAMPLE_LOAN = {
     "loan_id": "L001",
     "unpaid_balance": 200_000.0,
@@ -69,6 +70,32 @@ _THREE_LOAN_PACKAGE = {
 }
 
 
+@pytest.fixture(scope="module")
+def three_loan_pkg():
+    """3-loan Package, built once per module without revalidation. Treat as read-only."""
+    return Package.model_construct(**{
+        **_THREE_LOAN_PACKAGE,
+        "loans": [Loan.model_construct(**loan) for loan in _THREE_LOAN_PACKAGE["loans"]],
+    })
+
+
+@pytest.fixture(scope="module")
+def three_loan_analysis(three_loan_pkg):
+    """One analysis pass over the 3-loan package, shared by the run_analysis tests.
+
+    Also guards the sharing itself: the analysis must leave the package untouched.
+    """
+    before = three_loan_pkg.model_dump()
+    analysis = run_prepayment_analysis(three_loan_pkg)
+    assert three_loan_pkg.model_dump() == before, "run_prepayment_analysis mutated its package"
+    return analysis
+
+
+def test_package_schema_still_valid(three_loan_pkg):
+    """The unvalidated fixture matches what the real validator produces."""
+    assert Package(**_THREE_LOAN_PACKAGE).model_dump() == three_loan_pkg.model_dump()
+
+
 def test_compute_pandi():
     """Standard amortization P&I should match known values."""
     # $200,000 at 6.5% for 360 months → ~$1,264.14
@@ -82,6 +109,22 @@ def test_compute_pandi_zero_rate():
     assert abs(pandi - 120_000 / 360) < 0.01
 
 
+def test_compute_pandi_matches_vectorized_annuity(three_loan_pkg):
+    """compute_pandi per loan agrees with one array evaluation of the annuity formula."""
+    loans = [*three_loan_pkg.loans, three_loan_pkg.loans[0].model_copy(update={"interest_rate": 0.0})]
+    b = np.array([l.unpaid_balance for l in loans])
+    rate_pct = np.array([l.interest_rate * 100 for l in loans])
+    n = np.array([l.remaining_term for l in loans])
+
+    r = rate_pct / 1200.0
+    growth = (1 + r) ** n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = np.where(r > 0, b * r * growth / (growth - 1), b / n)
+
+    got = np.array([compute_pandi(bal, rp, term) for bal, rp, term in zip(b, rate_pct, n)])
+    np.testing.assert_allclose(got, expected, rtol=1e-9)
+
+
 def test_compute_apex2_multiplier_bands():
     """Verify band assignment and multiplier retrieval."""
     dims = compute_apex2_multiplier(660, 7.2, 85, 240_000, 4.5)
@@ -91,8 +134,8 @@ def test_compute_apex2_multiplier_bands():
     assert dims["ltv_band"] == "85% - 89.99%"
     assert dims["loan_size_band"] == "$200,000 - $249,999"
     # avg_4dim should be mean of 4 dimensions
-    expected_avg = (dims["dim_credit"] + dims["dim_rate_delta"] + dims["dim_ltv"] + dims["dim_loan_size"]) / 4
-    assert abs(dims["avg_4dim"] - expected_avg) < 0.0001
+    dim_vec = np.array([dims["dim_credit"], dims["dim_rate_delta"], dims["dim_ltv"], dims["dim_loan_size"]])
+    np.testing.assert_allclose(dims["avg_4dim"], dim_vec.mean(), atol=1e-4)
 
 
 def test_apex2_amortize_matches_known():
@@ -111,6 +154,22 @@ def test_apex2_amortize_with_higher_payment():
     assert nper_fast < nper_base
 
 
+def test_apex2_amortize_batch_matches_scalar():
+    """Batch NPER equals the scalar solver; unsolvable inputs become NaN."""
+    pv = np.array([200_000, 200_000, 200_000, 200_000, 150_000])
+    pmt = np.array([1264.14, 2500, 0.0, 500.0, 1100.0])
+    rate = np.array([6.5, 6.5, 6.5, 6.5, 0.0])
+
+    npers = apex2_amortize_batch(pv, pmt, rate)
+
+    for got, args in zip(npers.tolist(), zip(pv, pmt, rate)):
+        expected = apex2_amortize(*args)
+        if expected is None:
+            assert math.isnan(got)
+        else:
+            assert got == expected
+
+
 def test_project_effective_life_flat_vs_seasoned():
     """Seasoning ramp should make effective life longer for new loans."""
     pandi = compute_pandi(200_000, 7.0, 280)
@@ -121,10 +180,32 @@ def test_project_effective_life_flat_vs_seasoned():
     assert life_seasoned > life_flat
 
 
-def test_run_analysis_structure():
+@pytest.mark.parametrize("use_seasoning", [False, True])
+def test_project_effective_life_batch_matches_scalar(use_seasoning):
+    """Batched projection over an (age, loan) grid equals the scalar loop."""
+    balances = np.array([200_000.0, 55_000.0, 410_000.0])
+    rates = np.array([7.0, 9.5, 5.25])
+    rems = np.array([280, 120, 360])
+    mults = np.array([2.5, 1.0, 0.8])
+    pandis = np.array([compute_pandi(b, r, n) for b, r, n in zip(balances, rates, rems)])
+    ages = np.arange(0, 61, 12)[:, None]
+
+    lives = project_effective_life_batch(
+        balances, pandis, rates, mults, ages, rems, use_seasoning=use_seasoning,
+    )
+
+    expected = [
+        [project_effective_life(b, p, r, m, int(a), int(n), use_seasoning=use_seasoning)
+         for b, p, r, m, n in zip(balances, pandis, rates, mults, rems)]
+        for a in ages[:, 0]
+    ]
+    assert lives.tolist() == expected
+
+
+@pytest.mark.xdist_group("prepay_analysis")
+def test_run_analysis_structure(three_loan_analysis):
     """Full integration: 3-loan package should return all fields."""
-    pkg = Package(**_THREE_LOAN_PACKAGE)
-    result = run_prepayment_analysis(pkg)
+    result = three_loan_analysis
 
     assert result.summary.loan_count == 3
     assert result.summary.total_upb > 0
@@ -138,25 +219,24 @@ def test_run_analysis_structure():
     assert len(result.seasoning_sensitivity) > 0
 
 
-def test_run_analysis_credit_bands_populated():
+@pytest.mark.xdist_group("prepay_analysis")
+def test_run_analysis_credit_bands_populated(three_loan_analysis):
     """Credit bands should group the 3 test loans correctly."""
-    pkg = Package(**_THREE_LOAN_PACKAGE)
-    result = run_prepayment_analysis(pkg)
+    result = three_loan_analysis
 
     assert len(result.credit_bands) >= 2  # 590, 660, 720 span multiple bands
     total_loans = sum(b.loan_count for b in result.credit_bands)
     assert total_loans == 3
 
 
-def test_run_analysis_seasoning_sensitivity_decreasing():
+@pytest.mark.xdist_group("prepay_analysis")
+def test_run_analysis_seasoning_sensitivity_decreasing(three_loan_analysis):
     """Older assumed age should produce shorter or equal effective life."""
-    pkg = Package(**_THREE_LOAN_PACKAGE)
-    result = run_prepayment_analysis(pkg)
+    result = three_loan_analysis
 
-    lives = [p.effective_life_months for p in result.seasoning_sensitivity]
+    lives = np.fromiter((p.effective_life_months for p in result.seasoning_sensitivity), dtype=float)
     # Each point should be <= the previous (seasoning makes prepay faster)
-    for i in range(1, len(lives)):
-        assert lives[i] <= lives[i - 1] + 0.1  # small tolerance for rounding
+    assert (np.diff(lives) <= 0.1).all(), lives  # small tolerance for rounding
 
 
 def test_missing_credit_score_defaults():
@@ -175,11 +255,13 @@ def test_missing_credit_score_defaults():
     assert detail.credit_band == "676-700"
 
 
-def test_endpoint_returns_200():
+def test_endpoint_returns_200(client):
     """POST to /api/prepayment/analyze with valid package."""
-    response = client.post("/api/prepayment/analyze", json={
-        "package": _THREE_LOAN_PACKAGE,
-    })
+    response = client.post(
+        "/api/prepayment/analyze",
+        content=orjson.dumps({"package": _THREE_LOAN_PACKAGE}),
+        headers={"content-type": "application/json"},
+    )
     assert response.status_code == 200
     data = response.json()
     assert "summary" in data
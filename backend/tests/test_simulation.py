@@ -1,27 +1,44 @@
 """Tests for the simulation engine — scenarios, PMT, cash flows, Monte Carlo."""
 import math
+import random
+
+import numpy as np
+import pytest
 
 from app.models.loan import Loan
 from app.models.simulation import SimulationConfig
 from app.simulation.scenarios import get_scenario_params, list_scenario_names
-from app.simulation.cash_flow import calculate_monthly_payment, project_cash_flows
-from app.simulation.state_transitions import get_monthly_transitions
-from app.simulation.engine import simulate_loan
+from app.simulation.cash_flow import (
+    calculate_monthly_payment,
+    project_cash_flows,
+    project_cash_flows_multi,
+    project_mc_present_values,
+)
+from app.simulation.state_transitions import get_monthly_transition_arrays, get_monthly_transitions
+from app.simulation.engine import _generate_shocks, simulate_loan
+
+
+# Validated once; _make_loan copies it with overrides instead of revalidating
+_LOAN_TEMPLATE = Loan(
+    loan_id="L001",
+    unpaid_balance=200_000.0,
+    interest_rate=0.065,
+    original_term=360,
+    remaining_term=300,
+    loan_age=60,
+    credit_score=720,
+    ltv=0.75,
+)
 
 
 def _make_loan(**overrides) -> Loan:
-    defaults = dict(
-        loan_id="L001",
-        unpaid_balance=200_000.0,
-        interest_rate=0.065,
-        original_term=360,
-        remaining_term=300,
-        loan_age=60,
-        credit_score=720,
-        ltv=0.75,
-    )
-    defaults.update(overrides)
-    return Loan(**defaults)
+    return _LOAN_TEMPLATE.model_copy(update=overrides) if overrides else _LOAN_TEMPLATE
+
+
+def test_make_loan_matches_validated():
+    """model_copy shortcut builds the same Loan the validator would."""
+    loan = _make_loan(remaining_term=60)
+    assert Loan(**loan.model_dump()).model_dump() == loan.model_dump()
 
 
 # --- Scenario tests ---
@@ -78,55 +95,78 @@ def test_pmt_zero_term():
 # --- Cash flow projection tests ---
 
 
-def test_cash_flows_length_close_to_term():
+def test_cash_flows_length_close_to_term(scenarios):
     loan = _make_loan(remaining_term=60)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 2, scenario)
     # Prepayment + defaults can shorten effective life significantly
     assert len(cfs) >= 20
     assert len(cfs) <= 60
 
 
-def test_cash_flows_first_month_is_one():
+def test_cash_flows_first_month_is_one(scenarios):
     loan = _make_loan(remaining_term=60)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 2, scenario)
     assert cfs[0].month == 1
 
 
-def test_cash_flows_pv_positive():
+def test_cash_flows_pv_positive(scenarios):
     loan = _make_loan(remaining_term=60)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 2, scenario)
     total_pv = sum(cf.present_value for cf in cfs)
     assert total_pv > 0
 
 
+def test_cash_flows_multi_matches_single_bucket(scenarios):
+    loan = _make_loan(remaining_term=60)
+    scenario = scenarios["mild_recession"]
+    results = project_cash_flows_multi(loan, [1, 3, 5], scenario)
+    assert results == [project_cash_flows(loan, b, scenario) for b in (1, 3, 5)]
+
+
 # --- State transition tests ---
 
 
-def test_transitions_length():
-    scenario = get_scenario_params("baseline")
+def test_transitions_length(scenarios):
+    scenario = scenarios["baseline"]
     transitions = get_monthly_transitions(3, 60, 120, scenario)
     assert len(transitions) == 120
 
 
-def test_stressed_transitions_have_higher_defaults():
-    baseline = get_scenario_params("baseline")
-    severe = get_scenario_params("severe_recession")
+def test_stressed_transitions_have_higher_defaults(scenarios):
+    baseline = scenarios["baseline"]
+    severe = scenarios["severe_recession"]
     t_base = get_monthly_transitions(3, 60, 12, baseline)
     t_severe = get_monthly_transitions(3, 60, 12, severe)
     # Severe recession should have higher marginal default in month 1
     assert t_severe[0].marginal_default >= t_base[0].marginal_default
 
 
+def test_transition_arrays_match_rows(scenarios):
+    """Array (SoA) and row (list of MonthlyTransition) forms carry the same values."""
+    scenario = scenarios["mild_recession"]
+    rows = get_monthly_transitions(2, 12, 60, scenario, loan_rate=0.09)
+    arrays = get_monthly_transition_arrays(2, 12, 60, scenario, loan_rate=0.09)
+    for field in arrays._fields:
+        assert getattr(arrays, field).tolist() == [getattr(tx, field) for tx in rows]
+
+
 # --- Monte Carlo engine tests ---
 
+_MC_36_CONFIG = SimulationConfig(n_simulations=10, include_stochastic=True, stochastic_seed=42)
 
-def test_simulate_loan_returns_result():
-    loan = _make_loan(remaining_term=60)
-    config = SimulationConfig(n_simulations=5, include_stochastic=True, stochastic_seed=42)
-    result = simulate_loan(loan, config)
+
+@pytest.fixture(scope="module")
+def mc_result_36():
+    """Seeded 10-path MC valuation of a 36-month loan, shared across MC tests."""
+    return simulate_loan(_make_loan(remaining_term=36), _MC_36_CONFIG)
+
+
+@pytest.mark.xdist_group("mc_36")
+def test_simulate_loan_returns_result(mc_result_36):
+    result = mc_result_36
     assert result.loan_id == "L001"
     assert result.bucket_id in range(1, 6)
     assert result.expected_pv > 0
@@ -142,22 +182,18 @@ def test_deterministic_reproducibility():
     assert r1.pv_by_scenario == r2.pv_by_scenario
 
 
-def test_mc_distribution_populated():
-    loan = _make_loan(remaining_term=36)
-    config = SimulationConfig(n_simulations=10, include_stochastic=True, stochastic_seed=42)
-    result = simulate_loan(loan, config)
+@pytest.mark.xdist_group("mc_36")
+def test_mc_distribution_populated(mc_result_36):
     # Baseline-only MC: 10 sims
-    assert len(result.pv_distribution) == 10
-    # Distribution is no longer sorted — raw simulation-path order preserved
-    assert len(result.pv_distribution) > 0
+    assert len(mc_result_36.pv_distribution) == 10
 
 
-def test_mc_reproducible_with_seed():
-    loan = _make_loan(remaining_term=36)
-    config = SimulationConfig(n_simulations=10, include_stochastic=True, stochastic_seed=99)
-    r1 = simulate_loan(loan, config)
-    r2 = simulate_loan(loan, config)
-    assert r1.pv_distribution == r2.pv_distribution
+@pytest.mark.slow
+@pytest.mark.xdist_group("mc_36")
+def test_mc_reproducible_with_seed(mc_result_36):
+    # Second run with the same seed must reproduce the shared result exactly
+    rerun = simulate_loan(_make_loan(remaining_term=36), _MC_36_CONFIG)
+    assert np.array_equal(mc_result_36.pv_distribution, rerun.pv_distribution)
 
 
 def test_stress_scenarios_produce_lower_pv():
@@ -169,21 +205,33 @@ def test_stress_scenarios_produce_lower_pv():
     assert severe_pv < baseline_pv
 
 
-def test_percentiles_present_when_mc_enabled():
-    loan = _make_loan(remaining_term=36)
-    config = SimulationConfig(n_simulations=10, include_stochastic=True, stochastic_seed=42)
-    result = simulate_loan(loan, config)
-    for key in ("p5", "p25", "p50", "p75", "p95"):
-        assert key in result.pv_percentiles
-    assert result.pv_percentiles["p5"] <= result.pv_percentiles["p95"]
+@pytest.mark.xdist_group("mc_36")
+def test_percentiles_present_when_mc_enabled(mc_result_36):
+    p = mc_result_36.pv_percentiles
+    vals = np.array([p[k] for k in ("p5", "p25", "p50", "p75", "p95")])
+    assert (np.diff(vals) >= 0).all(), p
+
+
+def test_mc_present_values_match_per_path_reference(scenarios):
+    """Batched in-place PV reduction equals summing each path's MonthlyCashFlow PVs."""
+    loan = _make_loan(remaining_term=120, loan_age=240)
+    scenario = scenarios["baseline"]
+    shocks = _generate_shocks(25, loan.remaining_term, random.Random(7))
+
+    batched = project_mc_present_values(loan, 3, scenario, shocks)
+    reference = [
+        round(sum(cf.present_value for cf in project_cash_flows(loan, 3, scenario, shocks[i])), 2)
+        for i in range(len(shocks))
+    ]
+    np.testing.assert_allclose(batched, reference, rtol=0, atol=1e-9)
 
 
 # --- Prepayment tests ---
 
 
-def test_cash_flows_have_prepay_fields():
+def test_cash_flows_have_prepay_fields(scenarios):
     loan = _make_loan(remaining_term=60)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 3, scenario)
     for cf in cfs:
         assert hasattr(cf, "prepay_probability")
@@ -192,17 +240,17 @@ def test_cash_flows_have_prepay_fields():
         assert cf.expected_prepayment >= 0.0
 
 
-def test_prepayment_shortens_effective_life():
+def test_prepayment_shortens_effective_life(scenarios):
     """With prepayment, the pool balance should reach zero faster than remaining term."""
     loan = _make_loan(remaining_term=300)
-    scenario = get_scenario_params("baseline")
+    scenario = scenarios["baseline"]
     cfs = project_cash_flows(loan, 3, scenario)
     # Effective life should be notably shorter than 300 months
     assert len(cfs) < 300
 
 
-def test_transitions_have_marginal_prepay():
-    scenario = get_scenario_params("baseline")
+def test_transitions_have_marginal_prepay(scenarios):
+    scenario = scenarios["baseline"]
     transitions = get_monthly_transitions(3, 60, 12, scenario)
     for tx in transitions:
         assert hasattr(tx, "marginal_prepay")
@@ -210,9 +258,9 @@ def test_transitions_have_marginal_prepay():
         assert tx.marginal_prepay < 1.0
 
 
-def test_recession_slows_prepayment():
-    scenario_base = get_scenario_params("baseline")
-    scenario_severe = get_scenario_params("severe_recession")
+def test_recession_slows_prepayment(scenarios):
+    scenario_base = scenarios["baseline"]
+    scenario_severe = scenarios["severe_recession"]
     tx_base = get_monthly_transitions(3, 60, 12, scenario_base)
     tx_severe = get_monthly_transitions(3, 60, 12, scenario_severe)
     # Severe recession has prepayment_multiplier=0.4 → lower prepay
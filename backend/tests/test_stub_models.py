@@ -1,4 +1,5 @@
 """Tests for stub models — DEQ, default, recovery, cost-of-capital."""
+import numpy as np
 import pytest
 
 from app.ml.stub_deq import get_deq_rate
@@ -27,10 +28,8 @@ def test_deq_seasoning_decreases():
 
 def test_deq_riskier_buckets_higher():
     """Higher-risk buckets should have higher DEQ rates at same age."""
-    age = 12
-    rates = [get_deq_rate(bid, age) for bid in range(1, 6)]
-    for i in range(len(rates) - 1):
-        assert rates[i] < rates[i + 1]
+    rates = get_deq_rate(np.arange(1, 6), 12)
+    assert (np.diff(rates) > 0).all(), rates
 
 
 def test_deq_rate_positive():
@@ -40,14 +39,27 @@ def test_deq_rate_positive():
             assert get_deq_rate(bid, age) > 0
 
 
+def test_deq_rate_batch():
+    """Broadcast (bucket, age) grid matches scalar calls; positive, riskier is higher."""
+    buckets = np.arange(1, 6)[:, None]
+    ages = np.array([0, 12, 60, 120, 360])[None, :]
+    grid = get_deq_rate(buckets, ages)
+    assert grid.shape == (5, 5)
+    assert (grid > 0).all()
+    assert (np.diff(grid, axis=0) > 0).all()   # riskier buckets higher
+    assert (np.diff(grid, axis=1) < 0).all()   # seasoning lowers DEQ
+    np.testing.assert_allclose(
+        grid, [[get_deq_rate(b, a) for a in ages[0].tolist()] for b in range(1, 6)], rtol=1e-15,
+    )
+
+
 # --- Default model tests ---
 
 def test_default_severity_progression():
     """Default probability should increase with DPD severity."""
     tiers = ["current", "30dpd", "60dpd", "90dpd", "120dpd", "150dpd", "180dpd"]
-    probs = [get_default_probability(t) for t in tiers]
-    for i in range(len(probs) - 1):
-        assert probs[i] <= probs[i + 1], f"{tiers[i]} should be <= {tiers[i+1]}"
+    probs = np.array([get_default_probability(t) for t in tiers])
+    assert (np.diff(probs) >= 0).all(), dict(zip(tiers, probs.tolist()))
 
 
 def test_default_current_is_zero():
@@ -63,9 +75,16 @@ def test_loss_severity_range():
 
 def test_loss_severity_increases_with_risk():
     """Riskier buckets should have higher loss severity."""
-    severities = [get_loss_severity(bid) for bid in range(1, 6)]
-    for i in range(len(severities) - 1):
-        assert severities[i] <= severities[i + 1]
+    severities = get_loss_severity(np.arange(1, 6))
+    assert (np.diff(severities) >= 0).all(), severities
+
+
+def test_loss_severity_batch():
+    """Array of bucket_ids returns per-bucket severities; unknown ids get the default."""
+    sev = get_loss_severity(np.array([1, 2, 3, 4, 5, 99]))
+    assert sev.tolist() == [get_loss_severity(b) for b in (1, 2, 3, 4, 5, 99)]
+    assert ((sev > 0) & (sev < 1)).all()
+    assert (np.diff(sev[:5]) >= 0).all()
 
 
 # --- Recovery model tests ---
@@ -1,6 +1,9 @@
 """Tests for the stub prepayment model — CPR/SMM, seasoning, rate incentive."""
 import math
 
+import numpy as np
+import pytest
+
 from app.ml.stub_prepayment import (
     cpr_to_smm,
     get_prepay_hazard,
@@ -21,13 +24,13 @@ def test_smm_roundtrip():
     cpr = 0.10
     smm = cpr_to_smm(cpr)
     recovered_cpr = 1.0 - (1.0 - smm) ** 12
-    assert abs(recovered_cpr - cpr) < 1e-10
+    assert math.isclose(recovered_cpr, cpr, abs_tol=1e-10)
 
 
 def test_smm_known_value():
     """10% CPR should give ~0.87% SMM."""
     smm = cpr_to_smm(0.10)
-    assert abs(smm - 0.00874) < 0.001
+    assert math.isclose(smm, 0.00874, abs_tol=0.001)
 
 
 def test_smm_clamped_above_one():
@@ -81,34 +84,46 @@ def test_rate_incentive_in_the_money():
 # --- get_prepay_hazard ---
 
 
-def test_bucket_ordering():
+_GRID_BUCKETS = np.arange(1, 6)
+_GRID_AGES = np.array([5, 60, 120])
+_GRID_RATES = np.array([0.04, 0.065, 0.10])
+
+
+@pytest.fixture(scope="module")
+def hazard_grid():
+    """SMM over (bucket, age, rate) in one broadcast call."""
+    return get_prepay_hazard(
+        _GRID_BUCKETS[:, None, None], _GRID_AGES[None, :, None], _GRID_RATES[None, None, :],
+    )
+
+
+def test_hazard_grid_matches_scalar(hazard_grid):
+    """Broadcast path agrees with the scalar formula point by point."""
+    expected = [
+        [[get_prepay_hazard(b, a, r) for r in _GRID_RATES.tolist()] for a in _GRID_AGES.tolist()]
+        for b in _GRID_BUCKETS.tolist()
+    ]
+    np.testing.assert_allclose(hazard_grid, expected, rtol=1e-12)
+
+
+def test_bucket_ordering(hazard_grid):
     """Prime loans should prepay faster than sub-prime."""
-    age, rate = 60, 0.065
-    h1 = get_prepay_hazard(1, age, rate)
-    h4 = get_prepay_hazard(4, age, rate)
-    h5 = get_prepay_hazard(5, age, rate)
-    assert h1 > h4 > h5
+    assert (np.diff(hazard_grid[:, 1, 1]) < 0).all()
 
 
-def test_seasoning_effect():
+def test_seasoning_effect(hazard_grid):
     """New loans should have lower prepay hazard than seasoned ones."""
-    h_new = get_prepay_hazard(3, 5, 0.065)
-    h_seasoned = get_prepay_hazard(3, 60, 0.065)
-    assert h_seasoned > h_new
+    assert hazard_grid[2, 1, 1] > hazard_grid[2, 0, 1]
 
 
-def test_rate_effect():
+def test_rate_effect(hazard_grid):
     """Higher loan rate → higher prepay hazard (refi incentive)."""
-    h_low = get_prepay_hazard(3, 60, 0.04)
-    h_high = get_prepay_hazard(3, 60, 0.10)
-    assert h_high > h_low
+    assert (np.diff(hazard_grid[2, 1, :]) > 0).all()
 
 
-def test_positive_for_all_buckets():
+def test_positive_for_all_buckets(hazard_grid):
     """All buckets should produce positive SMM for seasoned loans."""
-    for bid in range(1, 6):
-        h = get_prepay_hazard(bid, 60, 0.065)
-        assert h > 0.0
+    assert (hazard_grid[:, 1:, :] > 0.0).all()
 
 
 def test_capped_below_one():
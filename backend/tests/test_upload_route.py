@@ -1,25 +1,30 @@
 """Tests for the POST /packages/upload endpoint."""
 import io
 import pytest
-from fastapi.testclient import TestClient
-from openpyxl import Workbook
 
-from app.main import app
+from tests._xlsx_fixture import build_xlsx
 
-client = TestClient(app)
+_DEFAULT_COLUMNS = [
+    "Current Balance", "Current Rate",
+    "Most Recent Blended Credit Score for Pricing",
+    "LTV used for Pricing (%)", "Seasoning", "FNBA Calculated Rem Term",
+]
+
+_XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 def _make_excel_bytes(rows, columns=None):
     """Create an in-memory Excel file and return bytes."""
-    wb = Workbook()
-    ws = wb.active
-    if columns is None:
-        columns = [
-            "Current Balance", "Current Rate",
-            "Most Recent Blended Credit Score for Pricing",
-            "LTV used for Pricing (%)", "Seasoning", "FNBA Calculated Rem Term",
-        ]
-    ws.append(columns)
+    return build_xlsx(columns or _DEFAULT_COLUMNS, rows)
+
+
+def _make_openpyxl_bytes(rows, columns=None):
+    """Same workbook written by openpyxl — the shape real tape exports have."""
+    from openpyxl import Workbook  # deferred: only the --full-xlsx run pays for openpyxl
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(columns or _DEFAULT_COLUMNS)
     for row in rows:
         ws.append(row)
     buf = io.BytesIO()
@@ -27,13 +32,19 @@ def _make_excel_bytes(rows, columns=None):
     return buf.getvalue()
 
 
+@pytest.fixture(scope="session")
+def sample_xlsx_bytes():
+    """Canonical 2-loan tape, serialized once per session. Bytes are immutable."""
+    return _make_excel_bytes([
+        [250000, 7.2, 660, 85, 80, 280],
+        [150000, 6.8, 700, 75, 60, 300],
+    ])
+
+
 class TestUploadRoute:
-    def test_valid_upload(self):
+    def test_valid_upload(self, client, sample_xlsx_bytes):
         """POST valid Excel -> 200 with correct Package structure."""
-        data = _make_excel_bytes([
-            [250000, 7.2, 660, 85, 80, 280],
-            [150000, 6.8, 700, 75, 60, 300],
-        ])
+        data = sample_xlsx_bytes
         response = client.post(
             "/api/packages/upload",
             files={"file": ("test_tape.xlsx", io.BytesIO(data), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")},
@@ -44,7 +55,7 @@ class TestUploadRoute:
         assert len(pkg["loans"]) == 2
         assert pkg["package_id"].startswith("PKG-UPLOAD")
 
-    def test_non_excel_rejected(self):
+    def test_non_excel_rejected(self, client):
         """POST non-Excel file -> 400."""
         response = client.post(
             "/api/packages/upload",
@@ -53,7 +64,7 @@ class TestUploadRoute:
         assert response.status_code == 400
         assert "Unsupported file type" in response.json()["detail"]
 
-    def test_conversions_in_upload(self):
+    def test_conversions_in_upload(self, client):
         """Verify rate and LTV are converted correctly through the endpoint."""
         data = _make_excel_bytes([
             [200000, 7.2, 720, 85, 24, 336],
@@ -67,3 +78,44 @@ class TestUploadRoute:
         assert abs(loan["interest_rate"] - 0.072) < 1e-6
         assert abs(loan["ltv"] - 0.85) < 1e-6
         assert loan["original_term"] == 360  # 336 + 24
+
+    def test_openpyxl_workbook_upload(self, client, request):
+        """Full styles/shared-strings workbook parses like the minimal one."""
+        if not request.config.getoption("--full-xlsx"):
+            pytest.skip("needs --full-xlsx")
+        data = _make_openpyxl_bytes([
+            [250000, 7.2, 660, 85, 80, 280],
+            [150000, 6.8, 700, 75, 60, 300],
+        ])
+        response = client.post(
+            "/api/packages/upload",
+            files={"file": ("full_tape.xlsx", io.BytesIO(data), _XLSX_MIME)},
+        )
+        assert response.status_code == 200
+        loans = response.json()["loans"]
+        assert [loan["unpaid_balance"] for loan in loans] == [250000, 150000]
+
+
+class TestUploadBatchRoute:
+    def test_batch_upload(self, client, sample_xlsx_bytes):
+        """POST 10 tapes in one request -> 10 Packages, in upload order."""
+        files = [
+            ("files", (f"tape_{i}.xlsx", io.BytesIO(sample_xlsx_bytes), _XLSX_MIME))
+            for i in range(10)
+        ]
+        response = client.post("/api/packages/upload_batch", files=files)
+        assert response.status_code == 200
+        packages = response.json()
+        assert len(packages) == 10
+        assert [p["name"] for p in packages] == [f"tape {i}" for i in range(10)]
+        assert all(p["loan_count"] == 2 for p in packages)
+
+    def test_batch_rejects_non_excel(self, client, sample_xlsx_bytes):
+        """One non-Excel file in the batch -> 400 for the whole request."""
+        files = [
+            ("files", ("tape.xlsx", io.BytesIO(sample_xlsx_bytes), _XLSX_MIME)),
+            ("files", ("data.csv", io.BytesIO(b"a,b,c\n1,2,3"), "text/csv")),
+        ]
+        response = client.post("/api/packages/upload_batch", files=files)
+        assert response.status_code == 400
+        assert "Unsupported file type" in response.json()["detail"]
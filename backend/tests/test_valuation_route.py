@@ -1,9 +1,9 @@
 """Tests for the POST /api/valuations/run endpoint."""
-from fastapi.testclient import TestClient
+import asyncio
 
-from app.main import app
-
-client = TestClient(app)
+import httpx
+import orjson
+import pytest
 
 _SAMPLE_LOAN = {
     "loan_id": "L001",
@@ -25,19 +25,60 @@ _SAMPLE_PACKAGE = {
     "loans": [_SAMPLE_LOAN],
 }
 
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _body(config=None) -> bytes:
+    """Serialize a /valuations/run request once, at import time."""
+    payload = {"package": _SAMPLE_PACKAGE}
+    if config is not None:
+        payload["config"] = config
+    return orjson.dumps(payload)
+
+
+# Request bodies are identical across runs — encode them once per module
+_PKG_JSON = _body()
+_PKG_JSON_MC_5 = _body({"n_simulations": 5, "include_stochastic": True, "stochastic_seed": 42})
+_PKG_JSON_DETERMINISTIC = _body({"n_simulations": 0, "include_stochastic": False})
+_PKG_JSON_MC_10 = _body({"n_simulations": 10, "include_stochastic": True, "stochastic_seed": 42})
+
+
+_BODIES = {
+    "default": _PKG_JSON,
+    "mc_5": _PKG_JSON_MC_5,
+    "deterministic": _PKG_JSON_DETERMINISTIC,
+    "mc_10": _PKG_JSON_MC_10,
+}
+
+
+@pytest.fixture(scope="module")
+def valuation_responses(client):
+    """Every payload in _BODIES, posted concurrently; wall time ~ the slowest run.
+
+    The route is sync, so FastAPI runs each request on its threadpool. Depends
+    on ``client`` so the app lifespan (models, warm kernels) has already run.
+    """
+    from app.main import app
 
-def test_valuation_returns_200():
-    response = client.post("/api/valuations/run", json={
-        "package": _SAMPLE_PACKAGE,
-    })
+    async def post_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(*(
+                ac.post("/api/valuations/run", content=body, headers=_JSON_HEADERS)
+                for body in _BODIES.values()
+            ))
+        return dict(zip(_BODIES, responses))
+
+    return asyncio.run(post_all())
+
+
+def test_valuation_returns_200(valuation_responses):
+    response = valuation_responses["default"]
     assert response.status_code == 200
 
 
-def test_valuation_response_structure():
-    response = client.post("/api/valuations/run", json={
-        "package": _SAMPLE_PACKAGE,
-        "config": {"n_simulations": 5, "include_stochastic": True, "stochastic_seed": 42},
-    })
+def test_valuation_response_structure(valuation_responses):
+    response = valuation_responses["mc_5"]
     assert response.status_code == 200
     data = response.json()
     assert data["package_id"] == "PKG-001"
@@ -51,28 +92,46 @@ def test_valuation_response_structure():
     assert data["loan_results"][0]["loan_id"] == "L001"
 
 
-def test_valuation_single_loan_has_cash_flows():
-    response = client.post("/api/valuations/run", json={
-        "package": _SAMPLE_PACKAGE,
-        "config": {"n_simulations": 0, "include_stochastic": False},
-    })
-    data = response.json()
+def test_valuation_single_loan_has_cash_flows(valuation_responses):
+    data = valuation_responses["deterministic"].json()
     loan_result = data["loan_results"][0]
     assert len(loan_result["monthly_cash_flows"]) > 0
     assert loan_result["monthly_cash_flows"][0]["month"] == 1
 
 
-def test_valuation_custom_config_small_n():
-    response = client.post("/api/valuations/run", json={
-        "package": _SAMPLE_PACKAGE,
-        "config": {"n_simulations": 10, "include_stochastic": True, "stochastic_seed": 42},
-    })
-    data = response.json()
+def test_valuation_custom_config_small_n(valuation_responses):
+    data = valuation_responses["mc_10"].json()
     # Baseline-only MC: 10 sims
     loan_result = data["loan_results"][0]
     assert len(loan_result["pv_distribution"]) == 10
 
 
-def test_valuation_no_body_returns_422():
+def test_valuation_precision(valuation_responses):
+    """Response money fields are the engine's float64 values — no narrowing on the wire."""
+    from app.models.package import Package
+    from app.models.simulation import SimulationConfig
+    from app.services.dual_track_service import valuate_package
+
+    config = SimulationConfig(n_simulations=10, include_stochastic=True, stochastic_seed=42)
+    reference = valuate_package(Package(**_SAMPLE_PACKAGE), config).loan_results[0]
+    loan_result = valuation_responses["mc_10"].json()["loan_results"][0]
+
+    assert loan_result["pv_distribution"] == reference.pv_distribution
+    assert loan_result["monthly_cash_flows"] == [
+        cf.model_dump() for cf in reference.monthly_cash_flows
+    ]
+
+
+@pytest.mark.slow
+def test_concurrent_matches_sequential(client, valuation_responses):
+    """Overlapping MC runs on the threadpool don't perturb each other's results."""
+    sequential = client.post("/api/valuations/run", content=_PKG_JSON_MC_10, headers=_JSON_HEADERS).json()
+    concurrent = valuation_responses["mc_10"].json()
+    sequential.pop("computed_at")
+    concurrent.pop("computed_at")
+    assert sequential == concurrent
+
+
+def test_valuation_no_body_returns_422(client):
     response = client.post("/api/valuations/run")
     assert response.status_code == 422